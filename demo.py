@@ -1,3 +1,4 @@
+import os
 import pygame as pg
 from pigui import *
 from pigui.colors import *
@@ -21,13 +22,14 @@ t = Label.from_background(os.path.join(base_path, "button", "blank", "textbg2.pn
 b = TextButton(100,50, action=lambda:print("Hello"), text="World", fgcolor=ORANGE_RED, alpha=True)
 b2 = ImageButton.from_image(os.path.join(base_path, "button", "like1.png"), action=lambda:print("Like"), high_image=os.path.join(base_path, "button", "like2.png"))
 i = InputField(200, 50)
-c = Container(50, 0, 500, 400, background=(base_path, "windows", "Window", "win6.png"))
+c = Container(50, 0, 500, 400, background=(base_path, "windows", "Window", "win6.png"), dirty=True)
 c.add(t, 50, 16)#, w=150, h=50)
 c.add(b, 80, 80)
 c.add(b2, 0, 100)
 c.add(i, 30,56)
 entities = [c]
 running = True
+window.fill(BLUE)
 
 
 #GAME LOGIC
@@ -60,11 +62,8 @@ def render():
 	'''handles the rendering'''
 	global window
 	global entities
-	window.fill(BLUE)
-	for e in entities:
-		e.draw(window)
-
-	pg.display.flip()
+	rects = draw_all(window, entities, background=BLUE)
+	pg.display.update(rects)
 
 
 def main_loop():
@@ -1,9 +1,47 @@
-print("Initialized PyGUI Python toolkit for Pygame.")
+"""pigUI, a GUI toolkit for Pygame.
+Submodules are only imported when one of their names is first used, so that importing pigui is cheap and has no side effect: a tool only using Container doesn't load fonts nor widgets.
+The assets and loader instances share their name with their submodule, which pigui.assets and pigui.loader refer to: import them with from pigui.assets import assets and from pigui.loader import loader."""
+import importlib
+
 name="pigUI"
-from pigui.colors import *
-from pigui.events import *
-from pigui.widgets import *
-from pigui.labels import *
-from pigui.buttons import *
-from pigui.input import *
-from pigui.container import *
+
+#submodule: public names it defines
+MODULES = {
+	"colors": ("ALPHA", "RED", "GREEN", "BLUE", "WHITE", "BLACK", "YELLOW", "DARK_YELLOW", "CYAN", "MAGENTA", "ORANGE", "LIGHT_GREY", "DARK_GREY", "ORANGE_RED"),
+	"profiling": ("Profiler", "profiler"),
+	"events": ("SYSTEM_EVENTS", "Singleton", "merge_motions", "Dispatcher", "SELECTED"),
+	"assets": ("AssetManager",),
+	"widgets": ("Offset", "load_surf", "release_surf", "Widget"),
+	"fonts": ("FontCache", "TextCache", "font_cache", "text_cache"),
+	"labels": ("Label", "Run", "TextBlock"),
+	"buttons": ("BUTTON_SLOTS", "AbstractButton", "TextButton", "ImageButton"),
+	"input": ("InputField",),
+	"spatial": ("SpatialGrid",),
+	"layout": ("Layout", "Item", "aligned", "Box", "Row", "Column", "Grid", "Anchor", "Stack"),
+	"container": ("SCALED_CACHE_SIZE", "is_opaque", "WidgetEntry", "Container", "draw_all"),
+	"lists": ("GridContainer", "ListContainer"),
+	"screen": ("merge_rects", "Screen"),
+	"overlay": ("ProfilerOverlay",),
+	"loader": ("Placeholder", "Loader"),
+	"atlas": ("Atlas",),
+	"animation": ("linear", "ease_in", "ease_out", "ease_in_out", "interpolate", "Tween", "Animator", "animator"),
+	"replay": ("Recorder", "Replay"),
+	"loop": ("Loop",),
+	"tables": ("TableColumn", "Table"),
+}
+
+EXPORTS = {attr: module for module, attrs in MODULES.items() for attr in attrs}
+
+__all__ = list(EXPORTS)
+
+def __getattr__(attr):
+	module = EXPORTS.get(attr)
+	if module is None:
+		raise AttributeError(f"module {__name__!r} has no attribute {attr!r}")
+	value = getattr(importlib.import_module(f"{__name__}.{module}"), attr)
+	globals()[attr] = value
+	return value
+
+def __dir__():
+	return sorted(set(globals())|set(__all__))
+
@@ -0,0 +1,157 @@
+import pygame as pg
+import time
+from collections import deque
+from pigui.profiling import profiler
+
+def linear(t):
+	return t
+
+def ease_in(t):
+	return t*t
+
+def ease_out(t):
+	return t*(2-t)
+
+def ease_in_out(t):
+	return 2*t*t if t<0.5 else -1+(4-2*t)*t
+
+
+def interpolate(start, end, t):
+	"""returns the value between start and end at t, from 0 to 1. Works on numbers and tuples of numbers like positions and colors. Integers stay integers"""
+	if isinstance(start, (tuple, list, pg.Color)):
+		return tuple(interpolate(a, b, t) for a, b in zip(start, end))
+	value = start+(end-start)*t
+	return round(value) if isinstance(start, int) and isinstance(end, int) else value
+
+
+class Tween(object):
+	"""Changes a value from start to end over duration seconds, handing each step to setter.
+	Steps are computed from the time elapsed, so frames which are skipped or late simply don't show the intermediate steps.
+
+	setter:   function called with each new value
+	easing:   function mapping the elapsed fraction of the duration to the fraction of the change. See linear, ease_in, ease_out and ease_in_out
+	on_done:  function called without arguments once the end value was set. It can start other tweens
+	key:      tweens with the same key replace each other, so that a new move of a widget takes over from the running one"""
+	def __init__(self, start, end, duration, setter, easing=linear, on_done=None, key=None):
+		self.start = start
+		self.end = end
+		self.duration = duration
+		self.setter = setter
+		self.easing = easing
+		self.on_done = on_done
+		self.key = key
+		self.began = None #time of the first step
+		self.value = start
+		self.done = False
+
+	def __repr__(self):
+		return f"<Tween from {self.start} to {self.end} in {self.duration}s at {self.value}>"
+
+	def step(self, now):
+		"""sets the value for the time now and returns whether the tween is done"""
+		if self.began is None:
+			self.began = now
+		t = min(1, (now-self.began)/self.duration) if self.duration>0 else 1
+		value = self.end if t>=1 else interpolate(self.start, self.end, self.easing(t))
+		if value!=self.value:
+			self.value = value
+			self.setter(value)
+		self.done = t>=1
+		return self.done
+
+
+class Animator(object):
+	"""Runs tweens: all of them are stepped in one pass by update, to be called once per frame.
+	When the pass takes longer than its budget, the remaining tweens are left for the next frame, starting with them. Since tweens are timed, their late steps jump to where they should be.
+	Moves go through Container.move and fades set Container.alpha, so only the regions which changed are drawn again.
+
+	clock: function returning the time in seconds"""
+	def __init__(self, clock=time.perf_counter):
+		self.clock = clock
+		self.tweens = deque()
+		self.keys = {} #key: running tween with this key
+
+	def __repr__(self):
+		return f"<Animator running {len(self.tweens)} tweens>"
+
+	def __len__(self):
+		return len(self.tweens)
+
+	@property
+	def active(self):
+		"""whether tweens are running"""
+		return bool(self.tweens)
+
+	def add(self, tween):
+		"""runs tween, replacing the running tween with the same key if any"""
+		if tween.key is not None:
+			previous = self.keys.get(tween.key)
+			if previous is not None:
+				self.tweens.remove(previous)
+			self.keys[tween.key] = tween
+		self.tweens.append(tween)
+		return tween
+
+	def cancel(self, tween):
+		"""stops tween where it is"""
+		if tween in self.tweens:
+			self.tweens.remove(tween)
+		if self.keys.get(tween.key) is tween:
+			del self.keys[tween.key]
+
+	def tween(self, target, attr, end, duration, easing=linear, on_done=None):
+		"""changes the attr attribute of target to end over duration seconds"""
+		return self.add(Tween(getattr(target, attr), end, duration, lambda value: setattr(target, attr, value), easing, on_done, key=(target, attr)))
+
+	def move(self, target, pos, duration, easing=ease_in_out, on_done=None):
+		"""moves a widget or container to pos: container-local for widgets and nested containers, on the destination for top-level containers"""
+		if target.container is not None:
+			container = target.container
+			start = container.widgets[target].rect.topleft
+			def setter(value):
+				if target.container is container:
+					container.move(target, (value, container.widgets[target].rect.size))
+		else:
+			start = (target.x, target.y)
+			def setter(value):
+				target.x, target.y = value
+		return self.add(Tween(start, tuple(pos), duration, setter, easing, on_done, key=(target, "pos")))
+
+	def fade(self, container, alpha, duration, easing=linear, on_done=None):
+		"""changes the opacity of a container to alpha, from 0 to 255"""
+		return self.add(Tween(container.alpha, int(alpha), duration, lambda value: setattr(container, "alpha", value), easing, on_done, key=(container, "alpha")))
+
+	def color(self, widget, attr, color, duration, easing=linear, on_done=None):
+		"""changes the color attr of widget, like the text_color of a label, to color and renders the widget again at each step"""
+		def setter(value):
+			setattr(widget, attr, value)
+			widget.changed = True
+			widget.make_surf()
+		return self.add(Tween(tuple(getattr(widget, attr)), tuple(color), duration, setter, easing, on_done, key=(widget, attr)))
+
+	def update(self, budget=0.002):
+		"""steps the running tweens for at most budget seconds (None for no limit). Returns the amount of tweens stepped"""
+		now = self.clock()
+		start = time.perf_counter()
+		stepped = 0
+		for i in range(len(self.tweens)):
+			if not self.tweens: #callbacks can cancel or replace the tweens left
+				break
+			if budget is not None and stepped and time.perf_counter()-start>budget:
+				break
+			tween = self.tweens.popleft()
+			stepped += 1
+			if not tween.step(now):
+				self.tweens.append(tween) #going to the back so that tweens left over by the budget come first next frame
+				continue
+			if self.keys.get(tween.key) is tween:
+				del self.keys[tween.key]
+			if tween.on_done:
+				tween.on_done()
+
+		if profiler.enabled:
+			profiler.count("tweens", stepped)
+		return stepped
+
+
+animator = Animator()
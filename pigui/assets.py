@@ -0,0 +1,92 @@
+import pygame as pg
+import threading
+
+class AssetManager(object):
+	"""Path-keyed cache of the images used by widgets and containers. Each image is decoded and converted to the display's pixel format once and the surface is then shared.
+	Shared surfaces must not be modified: widgets which need to draw onto them must work on a copy (see writable).
+
+	evict: whether an asset should be dropped from the cache as soon as it isn't referenced anymore. Otherwise unused assets are kept until evict_unused is called."""
+	def __init__(self, evict=False):
+		self.evict = evict
+		self.surfs = {}
+		self.refs = {}
+		self.alphas = {} #path: whether the image has an alpha channel, guessed once for loads with alpha None
+		self.lock = threading.RLock() #assets can be loaded from the loader's worker threads
+		#an entry looks as such
+		#(path, alpha): Surface
+
+	def __repr__(self):
+		return f"<AssetManager holding {len(self.surfs)} assets>"
+
+	def __len__(self):
+		return len(self.surfs)
+
+	def key(self, path, alpha=None):
+		"""returns the cache key of the image located at path, or None if alpha is None and the image was never decoded"""
+		if alpha is None:
+			alpha = self.alphas.get(path)
+			if alpha is None:
+				return None
+		return (path, bool(alpha))
+
+	def cached(self, path, alpha=None):
+		"""whether the image located at path is cached"""
+		with self.lock:
+			return self.key(path, alpha) in self.surfs
+
+	def load(self, path, alpha=None):
+		"""returns the shared surface of the image located at path and adds a reference to it.
+		alpha: whether the surface should be converted with an alpha channel. If None it is guessed from the image itself, once: it then shares the asset of the guessed alpha."""
+		with self.lock:
+			key = self.key(path, alpha)
+			if key not in self.surfs:
+				return self.insert(path, pg.image.load(path), alpha)
+			self.refs[key] += 1
+			return self.surfs[key]
+
+	def insert(self, path, surf, alpha=None):
+		"""converts surf, the decoded image located at path, caches it and adds a reference to it. Used by load and by the loader, which decodes images in the background.
+		If the asset is already cached, the cached surface is returned instead"""
+		with self.lock:
+			if alpha is None:
+				alpha = self.alphas.setdefault(path, bool(surf.get_flags() & pg.SRCALPHA))
+			key = self.key(path, alpha)
+			if key not in self.surfs:
+				self.surfs[key] = surf.convert_alpha() if alpha else surf.convert()
+				self.refs[key] = 0
+
+			self.refs[key] += 1
+			return self.surfs[key]
+
+	def writable(self, path, alpha=None):
+		"""returns a private copy of the image located at path, which can be modified freely"""
+		surf = self.load(path, alpha).copy()
+		self.release(path, alpha)
+		return surf
+
+	def release(self, path, alpha=None):
+		"""removes a reference to the asset. It will be evicted once unreferenced if the manager was made with evict=True"""
+		with self.lock:
+			key = self.key(path, alpha)
+			if key not in self.refs:
+				return
+			self.refs[key] -= 1
+			if self.evict and self.refs[key]<=0:
+				del self.surfs[key]
+				del self.refs[key]
+
+	def evict_unused(self):
+		"""drops all assets which aren't referenced anymore"""
+		with self.lock:
+			for key in [key for key, count in self.refs.items() if count<=0]:
+				del self.surfs[key]
+				del self.refs[key]
+
+	def clear(self):
+		with self.lock:
+			self.surfs.clear()
+			self.refs.clear()
+			self.alphas.clear()
+
+
+assets = AssetManager()
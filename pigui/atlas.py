@@ -0,0 +1,130 @@
+import pygame as pg
+import json
+import os
+from pigui.assets import assets
+
+class Atlas(object):
+	"""Packs many small images, like icons and the state images of buttons, into a few large surfaces called pages.
+	Images are given as subsurfaces of their page: widgets blit them as usual but all of them read from the same pixels, which saves memory and keeps the blit sources few.
+	Packed atlases can be saved to disk and loaded back, skipping the packing.
+
+	size:    width and height of a page. Larger images get a page of their own
+	padding: space left around each image, so that scaled images don't bleed on their neighbours"""
+	def __init__(self, size=1024, padding=1):
+		self.size = size
+		self.padding = padding
+		self.queued = {} #key: (surfaces of the states, alpha) waiting to be packed
+		self.pages = [] #(surface, alpha)
+		self.rects = {} #key: (page index, [rect of each state])
+		self.surfs = {} #(key, state): subsurface
+		self.shelves = {} #alpha: [page index, x, y, height of the current shelf], kept between packs so that images added later fill the same pages
+
+	def __repr__(self):
+		return f"<Atlas of {len(self.rects)} images on {len(self.pages)} pages>"
+
+	def __len__(self):
+		return len(self.rects)+len(self.queued)
+
+	def __contains__(self, key):
+		return key in self.rects or key in self.queued
+
+	def add(self, key, *imgs, alpha=None):
+		"""queues the images of key to be packed by the next pack. Several images are the states of a widget, like the image and high_image of an ImageButton, and are packed side by side.
+		imgs:  surfaces or paths to images, as given to load_surf
+		alpha: whether the images need an alpha channel. If None it is guessed from the images"""
+		assert imgs, ValueError(f"No image given for {key}")
+		surfs = []
+		for img in imgs:
+			if isinstance(img, tuple):
+				img = os.path.join(*img)
+			surfs.append(img if isinstance(img, pg.Surface) else pg.image.load(img))
+		if alpha is None:
+			alpha = any(surf.get_flags() & pg.SRCALPHA for surf in surfs)
+		self.queued[key] = (surfs, alpha)
+
+	def pack(self):
+		"""packs the queued images, highest first, on the shelves of the pages, adding pages when they are full. Already packed images are left where they are"""
+		blocks = sorted(self.queued.items(), key=lambda item: max(surf.get_height() for surf in item[1][0]), reverse=True)
+		self.queued = {}
+		shelves = self.shelves
+		pad = self.padding
+		for key, (surfs, alpha) in blocks:
+			w = sum(surf.get_width()+pad*2 for surf in surfs)
+			h = max(surf.get_height() for surf in surfs)+pad*2
+			if w>self.size or h>self.size:
+				page, x, y = self.new_page(alpha, max(w, self.size), max(h, self.size)), 0, 0
+			else:
+				shelf = shelves.get(alpha)
+				if shelf and shelf[1]+w>self.size:
+					shelf[1], shelf[2], shelf[3] = 0, shelf[2]+shelf[3], 0
+				if not shelf or shelf[2]+h>self.size:
+					shelf = shelves[alpha] = [self.new_page(alpha, self.size, self.size), 0, 0, 0]
+				page, x, y = shelf[0], shelf[1], shelf[2]
+				shelf[1] += w
+				shelf[3] = max(shelf[3], h)
+
+			rects = []
+			for surf in surfs:
+				rect = pg.Rect(x+pad, y+pad, surf.get_width(), surf.get_height())
+				self.pages[page][0].blit(surf, rect)
+				rects.append(rect)
+				x += rect.w+pad*2
+			self.rects[key] = (page, rects)
+
+	def new_page(self, alpha, w, h):
+		"""adds an empty page and returns its index"""
+		surf = pg.Surface((w, h), pg.SRCALPHA) if alpha else pg.Surface((w, h))
+		surf = surf.convert_alpha() if alpha else surf.convert()
+		surf.fill((0, 0, 0, 0))
+		self.pages.append((surf, alpha))
+		return len(self.pages)-1
+
+	def get(self, key, state=0):
+		"""returns the surface of the image of key, or of its state-th state. It is a subsurface of a page: it is shared and must not be modified"""
+		if key in self.queued:
+			self.pack()
+		if (key, state) not in self.surfs:
+			page, rects = self.rects[key]
+			self.surfs[(key, state)] = self.pages[page][0].subsurface(rects[state])
+		return self.surfs[(key, state)]
+
+	def states(self, key):
+		"""returns the surfaces of all states of key"""
+		if key in self.queued:
+			self.pack()
+		return [self.get(key, state) for state in range(len(self.rects[key][1]))]
+
+	def blit(self, dest, key, pos, state=0):
+		"""area-blits the image of key from its page to dest at pos"""
+		page, rects = self.rects[key]
+		return dest.blit(self.pages[page][0], pos, area=rects[state])
+
+	def save(self, path):
+		"""writes the pages as path-<n>.png images next to a path.json index. Queued images are packed first. Keys must be strings, numbers or tuples of them"""
+		if self.queued:
+			self.pack()
+		base = os.path.splitext(path)[0]
+		pages = []
+		for i, (surf, alpha) in enumerate(self.pages):
+			name = f"{base}-{i}.png"
+			pg.image.save(surf, name)
+			pages.append({"file": os.path.basename(name), "alpha": alpha})
+		index = [{"key": key, "page": page, "rects": [tuple(rect) for rect in rects]} for key, (page, rects) in self.rects.items()] #a list rather than an object so that keys keep their type
+		with open(base+".json", "w") as file:
+			json.dump({"size": self.size, "padding": self.padding, "pages": pages, "images": index}, file)
+
+	@classmethod
+	def load(cls, path):
+		"""returns the atlas saved at path by save. Its pages are shared through the assets cache. Keys are restored as they were if they are strings, numbers or tuples of them.
+		Images added to a loaded atlas are packed on new pages"""
+		base = os.path.splitext(path)[0]
+		with open(base+".json") as file:
+			data = json.load(file)
+		atlas = cls(data["size"], data["padding"])
+		folder = os.path.dirname(base)
+		for page in data["pages"]:
+			atlas.pages.append((assets.load(os.path.join(folder, page["file"]), page["alpha"]), page["alpha"]))
+		for image in data["images"]:
+			key = tuple(image["key"]) if isinstance(image["key"], list) else image["key"]
+			atlas.rects[key] = (image["page"], [pg.Rect(rect) for rect in image["rects"]])
+		return atlas
@@ -0,0 +1,5 @@
+"""Headless benchmarks of pigUI's hot paths. Run them with python -m pigui.bench, see --help for options."""
+import os
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1") #keeps the JSON report alone on stdout
+from pigui.bench.scenes import *
+from pigui.bench.runner import *
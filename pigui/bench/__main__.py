@@ -0,0 +1,4 @@
+import sys
+from pigui.bench.runner import main
+
+sys.exit(main())
@@ -0,0 +1,222 @@
+import os
+import sys
+import json
+import argparse
+import time
+import platform
+import statistics
+import tracemalloc
+import subprocess
+import pygame as pg
+from pigui.events import Dispatcher
+from pigui.fonts import font_cache, text_cache
+from pigui.assets import assets
+from pigui.replay import Replay
+from pigui.bench.scenes import SCENES, flood
+
+def init_display(w=800, h=600):
+	"""opens a display without needing a screen. Surfaces can only be converted once a display exists"""
+	os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+	pg.init()
+	return pg.display.set_mode((w, h))
+
+def reset():
+	"""empties all process-wide caches and the dispatcher so that scenes don't benefit from each other"""
+	Dispatcher().clear()
+	font_cache.clear()
+	text_cache.clear()
+	assets.clear()
+
+def timings(samples):
+	"""summarizes a list of durations, in seconds, to milliseconds"""
+	return {
+		"mean": statistics.mean(samples)*1000,
+		"median": statistics.median(samples)*1000,
+		"max": max(samples)*1000,
+	}
+
+def per_frame(func, frames):
+	samples = []
+	for i in range(frames):
+		start = time.perf_counter()
+		func()
+		samples.append(time.perf_counter()-start)
+	return timings(samples)
+
+def bench_scene(name, n, frames=100, events=50, screen=None):
+	"""builds the name scene with n widgets and times, separately:
+	construct: building the scene
+	memory:    Python memory allocated per widget when building the scene, in bytes. Pixels are allocated by SDL and aren't counted
+	update:    Container.update of all containers, per frame
+	make_surf: Container.make_surf of all containers with every widget changed, per frame
+	draw:      Container.draw of all containers, per frame
+	dispatch:  Dispatcher.process of events events and the lookup of every registered widget, per frame"""
+	if not screen:
+		screen = pg.display.get_surface() or init_display()
+	reset()
+
+	start = time.perf_counter()
+	scene = SCENES[name](n)
+	construct = time.perf_counter()-start
+	containers = scene.containers
+
+	#built again since tracing slows construction down
+	reset()
+	tracemalloc.start()
+	traced = SCENES[name](n)
+	memory = tracemalloc.get_traced_memory()[0]/max(1, len(traced.widgets))
+	tracemalloc.stop()
+	del traced
+	reset()
+	scene = SCENES[name](n)
+	containers = scene.containers
+
+	def update():
+		for container in containers:
+			container.update()
+
+	def make_surf():
+		for widget in scene.widgets:
+			widget.changed = True
+		for container in containers:
+			container.make_surf()
+
+	def draw():
+		for container in containers:
+			container.draw(screen)
+
+	dispatcher = Dispatcher()
+	flooded = flood(events, *screen.get_size())
+	registered = list(dispatcher.widgets)
+	def dispatch():
+		dispatcher.process(flooded)
+		for widget in registered:
+			dispatcher[widget]
+
+	result = {
+		"scene": name,
+		"n": n,
+		"frames": frames,
+		"events": events,
+		"construct": construct*1000,
+		"memory": memory,
+		"update": per_frame(update, frames),
+		"make_surf": per_frame(make_surf, frames),
+		"draw": per_frame(draw, frames),
+		"dispatch": per_frame(dispatch, frames),
+	}
+	return result
+
+def bench_replay(path, name, n, screen=None):
+	"""replays the event log at path, written by pigui.replay.Recorder, against the name scene with n widgets and times each frame: dispatching its events, updating, making and drawing all containers"""
+	if not screen:
+		screen = pg.display.get_surface() or init_display()
+	reset()
+	scene = SCENES[name](n)
+
+	def frame():
+		for container in scene.containers:
+			container.update()
+			container.make_surf()
+			container.draw(screen)
+
+	replay = Replay(path)
+	return {
+		"scene": name,
+		"n": n,
+		"replay": path,
+		"frames": len(replay),
+		"frame": timings(replay.run(frame) or [0]),
+	}
+
+IMPORTS = ["import pigui", "from pigui import Container", "from pigui import *"]
+
+def bench_import(statement, runs=10):
+	"""times statement in runs fresh interpreters, so that no module is already imported"""
+	code = f"import time\nstart = time.perf_counter()\n{statement}\nprint(time.perf_counter()-start)"
+	env = dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT="1")
+	env["PYTHONPATH"] = os.pathsep.join(filter(None, [os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), env.get("PYTHONPATH")]))
+	samples = []
+	for i in range(runs):
+		output = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True).stdout
+		samples.append(float(output.split()[-1]))
+	return timings(samples)
+
+def run(scenes=None, sizes=(10, 100, 1000), frames=100, events=50, replay=None, imports=0):
+	"""runs the benchmarks of all scenes at all sizes and returns a JSON serializable report. All durations are in milliseconds.
+	replay:  path to an event log to replay against the scenes instead of the synthetic frames
+	imports: amount of fresh interpreters each import statement of IMPORTS is timed in, 0 not to time them"""
+	screen = init_display()
+	results = []
+	for name in scenes or SCENES:
+		for n in sizes:
+			if replay:
+				results.append(bench_replay(replay, name, n, screen=screen))
+			else:
+				results.append(bench_scene(name, n, frames=frames, events=events, screen=screen))
+
+	return {
+		"python": platform.python_version(),
+		"pygame": pg.version.ver,
+		"platform": platform.platform(),
+		"time": time.time(),
+		"results": results,
+		"imports": {statement: bench_import(statement, imports) for statement in IMPORTS} if imports else {},
+	}
+
+def compare(old, new, threshold=0.2):
+	"""returns (scene, n, metric, old, new) tuples for every per-frame mean, construction time or memory use of new which is more than threshold higher than in old"""
+	regressions = []
+	previous = {(r["scene"], r["n"], r.get("replay")): r for r in old["results"]}
+	for result in new["results"]:
+		key = (result["scene"], result["n"], result.get("replay"))
+		if key not in previous:
+			continue
+		for metric in ("construct", "memory", "update", "make_surf", "draw", "dispatch", "frame"):
+			if metric not in result or metric not in previous[key]:
+				continue
+			before = previous[key][metric]
+			after = result[metric]
+			if isinstance(before, dict):
+				before = before["mean"]
+				after = after["mean"]
+			if before and after>before*(1+threshold):
+				regressions.append((key[0], key[1], metric, before, after))
+
+	for statement, result in new.get("imports", {}).items():
+		before = old.get("imports", {}).get(statement)
+		if before and result["mean"]>before["mean"]*(1+threshold):
+			regressions.append((statement, 0, "import", before["mean"], result["mean"]))
+	return regressions
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(prog="python -m pigui.bench", description="Headless benchmarks of pigUI widgets and containers. Durations are reported in milliseconds.")
+	parser.add_argument("--scenes", nargs="+", choices=sorted(SCENES), help="scenes to run, all by default")
+	parser.add_argument("--sizes", nargs="+", type=int, default=[10, 100, 1000], help="amounts of widgets per scene")
+	parser.add_argument("--frames", type=int, default=100, help="frames timed per measure")
+	parser.add_argument("--events", type=int, default=50, help="events dispatched per frame")
+	parser.add_argument("--replay", help="event log recorded with pigui.replay.Recorder to replay against the scenes, timing whole frames")
+	parser.add_argument("--imports", type=int, default=0, metavar="RUNS", help="also times importing pigui in RUNS fresh interpreters")
+	parser.add_argument("--output", help="file to write the JSON report to instead of stdout")
+	parser.add_argument("--compare", help="previous JSON report to compare against. Exits with 1 if a measure regressed")
+	parser.add_argument("--threshold", type=float, default=0.2, help="relative slowdown considered a regression")
+	args = parser.parse_args(argv)
+
+	report = run(args.scenes, args.sizes, args.frames, args.events, args.replay, args.imports)
+	dump = json.dumps(report, indent=2)
+	if args.output:
+		with open(args.output, "w") as fh:
+			fh.write(dump)
+	else:
+		print(dump)
+
+	if args.compare:
+		with open(args.compare, "r") as fh:
+			old = json.load(fh)
+		regressions = compare(old, report, args.threshold)
+		for scene, n, metric, before, after in regressions:
+			unit = "B" if metric=="memory" else "ms"
+			print(f"{scene}[{n}] {metric}: {before:.3f}{unit} -> {after:.3f}{unit}", file=sys.stderr)
+		if regressions:
+			return 1
+	return 0
@@ -0,0 +1,124 @@
+import pygame as pg
+from pigui.colors import *
+from pigui.labels import Label
+from pigui.buttons import TextButton, ImageButton
+from pigui.input import InputField
+from pigui.container import Container
+from pigui.lists import ListContainer
+from pigui.atlas import Atlas
+
+class Scene(object):
+	"""A set of top-level containers built for benchmarking.
+
+	containers: the containers of the scene, in drawing order
+	widgets:    all widgets of the scene"""
+	def __init__(self, name, n, containers, widgets):
+		self.name = name
+		self.n = n
+		self.containers = containers
+		self.widgets = widgets
+
+	def __repr__(self):
+		return f"<Scene({self.name}, {self.n}) with {len(self.containers)} containers>"
+
+
+def grid_container(widgets, w, h, x=0, y=0, padding=2):
+	"""returns a container holding the widgets, all of size (w, h), laid out in a square grid. Cells are padded so that rounding can't make widgets overlap"""
+	cols = max(1, int(len(widgets)**0.5+0.5))
+	rows = max(1, -(-len(widgets)//cols))
+	cw = cols*(w+padding)
+	ch = rows*(h+padding)
+	container = Container(x, y, cw, ch, bgcolor=DARK_GREY)
+	for i, widget in enumerate(widgets):
+		px = (i%cols)*(w+padding)+padding/2
+		py = (i//cols)*(h+padding)+padding/2
+		container.add(widget, px*100/(cw-w), py*100/(ch-h))
+	return container
+
+def labels(n):
+	widgets = [Label(60, 20, text=f"Label {i}", bgcolor=WHITE) for i in range(n)]
+	return Scene("labels", n, [grid_container(widgets, 60, 20)], widgets)
+
+def buttons(n):
+	widgets = [TextButton(60, 20, action=lambda:None, text=f"Button {i}", bgcolor=WHITE) for i in range(n)]
+	return Scene("buttons", n, [grid_container(widgets, 60, 20)], widgets)
+
+def image_buttons(n):
+	image = pg.Surface((32, 32))
+	image.fill(ORANGE)
+	high_image = pg.Surface((32, 32))
+	high_image.fill(ORANGE_RED)
+	widgets = [ImageButton(24, 24, action=lambda:None, image=image, high_image=high_image) for i in range(n)]
+	return Scene("image_buttons", n, [grid_container(widgets, 24, 24)], widgets)
+
+def atlas_buttons(n, icons=32):
+	"""image buttons whose images are packed in an atlas, icons different ones"""
+	atlas = Atlas(size=256)
+	for i in range(icons):
+		image = pg.Surface((32, 32))
+		image.fill((i*8, 128, 0))
+		high_image = pg.Surface((32, 32))
+		high_image.fill((i*8, 0, 128))
+		atlas.add(i, image, high_image)
+	atlas.pack()
+	widgets = [ImageButton.from_atlas(atlas, i%icons, 24, 24, action=lambda:None) for i in range(n)]
+	return Scene("atlas_buttons", n, [grid_container(widgets, 24, 24)], widgets)
+
+def inputs(n):
+	widgets = [InputField(100, 20, hint_text=f"Field {i}") for i in range(n)]
+	return Scene("inputs", n, [grid_container(widgets, 100, 20)], widgets)
+
+def panels(n, per_panel=10):
+	"""n/per_panel containers of per_panel labels each, like a screen made of many small panels"""
+	containers = []
+	widgets = []
+	for i in range(max(1, n//per_panel)):
+		panel = [Label(60, 20, text=f"Label {j}", bgcolor=WHITE) for j in range(per_panel)]
+		containers.append(grid_container(panel, 60, 20, x=(i%10)*20, y=(i//10)*20))
+		widgets.extend(panel)
+	return Scene("panels", n, containers, widgets)
+
+def nested(n, per_panel=10):
+	"""n/per_panel panels of per_panel labels each, all inside one container"""
+	panels = []
+	widgets = []
+	for i in range(max(1, n//per_panel)):
+		panel = [Label(60, 20, text=f"Label {j}", bgcolor=WHITE) for j in range(per_panel)]
+		panels.append(grid_container(panel, 60, 20))
+		widgets.extend(panel)
+	return Scene("nested", n, [grid_container(panels, panels[0].w, panels[0].h)], widgets)
+
+def rows(n):
+	"""a scrolled list of n items"""
+	items = [f"Row {i}" for i in range(n)]
+	def bind(label, item):
+		label.text = item
+	container = ListContainer(0, 0, 200, 400, 20, factory=lambda: Label(200, 20, text="Row 000000", bgcolor=WHITE, font_size=14, enlarge=False), bind=bind, items=items)
+	container.make_surf()
+	widgets = [widget for slot in container.slots for widget in slot]
+	return Scene("rows", n, [container], widgets)
+
+
+SCENES = {
+	"labels": labels,
+	"buttons": buttons,
+	"image_buttons": image_buttons,
+	"atlas_buttons": atlas_buttons,
+	"inputs": inputs,
+	"panels": panels,
+	"nested": nested,
+	"rows": rows,
+}
+
+def flood(m, w=800, h=600):
+	"""returns m events as they could come in one frame: mostly mouse motion with some clicks and key presses"""
+	events = []
+	for i in range(m):
+		pos = ((i*37)%w, (i*53)%h)
+		if i%10==9:
+			events.append(pg.event.Event(pg.MOUSEBUTTONUP, pos=pos, button=1))
+		elif i%10==8:
+			events.append(pg.event.Event(pg.KEYDOWN, key=pg.K_a, unicode="a", mod=0))
+		else:
+			events.append(pg.event.Event(pg.MOUSEMOTION, pos=pos, rel=(1, 1), buttons=(0, 0, 0)))
+	return events
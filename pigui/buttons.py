@@ -2,9 +2,14 @@ import pygame as pg
 from pigui.widgets import *
 from pigui.colors import *
 from pigui.labels import Label
+from pigui.fonts import text_cache
+
+#state of all buttons. Declared by the concrete buttons since TextButton gets the slots of Label as well, and a class can only inherit slots from one branch
+BUTTON_SLOTS = ("action", "events", "_locked", "i")
 
 class AbstractButton(Widget):
 	"""docstring for Button"""
+	__slots__ = ()
 	def __init__(self, w, h, *args, alpha=False, action=None, locked=False, **kwargs):
 		super().__init__(w, h, *args, alpha=alpha, **kwargs)
 		self.w = w
@@ -28,12 +33,15 @@ class AbstractButton(Widget):
 
 
 class TextButton(AbstractButton, Label):
-	"""a button with text"""
-	def __init__(self, w, h, *args, alpha=False, action=None, text="", bgcolor=None, fgcolor=BLACK, font=None, font_size=20, underlined=False, bold=False, highlight_color=None, lock_color=LIGHT_GREY, **kwargs):
-		super().__init__(w, h, *args, alpha=alpha, action=action, text=text, bgcolor=bgcolor, fgcolor=fgcolor, font=font, font_size=font_size, underlined=underlined, bold=bold, **kwargs)
+	"""a button with text. The surfaces of its normal, highlighted and locked states are rendered once, when first shown, and then swapped"""
+	__slots__ = BUTTON_SLOTS+("highlighted", "lock_color", "states", "highlight_color")
+	cache_scaled = True
+	def __init__(self, w, h, *args, alpha=False, action=None, text="", bgcolor=None, fgcolor=BLACK, font=None, font_size=20, underlined=False, bold=False, highlight_color=None, lock_color=LIGHT_GREY, locked=False, **kwargs):
+		#state needs to be known before Label renders the button
 		self.highlighted = False
-		self.hover = True
+		self._locked = locked
 		self.lock_color=lock_color
+		self.states = {} #state: Surface, rendered lazily and never drawn onto
 
 		#guessing highlight color
 		if not highlight_color:
@@ -41,6 +49,9 @@ class TextButton(AbstractButton, Label):
 		else:
 			self.highlight_color = highlight_color
 
+		super().__init__(w, h, *args, alpha=alpha, action=action, text=text, bgcolor=bgcolor, fgcolor=fgcolor, font=font, font_size=font_size, underlined=underlined, bold=bold, locked=locked, **kwargs)
+		self.hover = True
+
 	def __repr__(self):
 		return f"<TextButton({self.w}, {self.h}), text={self._text}, hovered={self.hovered}"
 
@@ -48,77 +59,106 @@ class TextButton(AbstractButton, Label):
 	def from_background(cls, background, *args, **kwargs):
 		surf = load_surf(background)
 		rect = surf.get_rect()
-		return cls(rect.w, rect.h, *args, background=background, **kwargs)
+		widget = cls(rect.w, rect.h, *args, background=background, **kwargs)
+		release_surf(background) #the widget holds its own reference
+		return widget
 
 
 	@property
 	def locked(self):
-		return self.AbstractButton.locked()
+		return self._locked
 
 	@locked.setter
 	def locked(self, value):
 		if self._locked == bool(value):
 			return
 
-		self.font.fgcolor = bool(value)
+		self._locked = bool(value)
 		self.changed=True
 		self.make_surf()
 
+	@property
+	def state(self):
+		if self._locked:
+			return "locked"
+		if self.highlighted:
+			return "highlighted"
+		return "normal"
+
+	def state_surf(self, state):
+		"""returns the surface of the button in the given state, rendering it if it wasn't yet"""
+		if state not in self.states:
+			color = {"normal": self.fgcolor, "highlighted": self.highlight_color, "locked": self.lock_color}[state]
+			surf = self.bgsurf.copy()
+			offset = self.text_offsets(self._text)
+			surf.blit(text_cache.render(self.font, self._text, color), (offset.x, offset.y))
+			self.states[state] = surf
+		return self.states[state]
+
+	def make_surf(self, old_text=None):
+		"""shows the surface of the current state. If the text changed (old_text is given) all states will be rendered again"""
+		if old_text is not None:
+			self.states = {}
+		self.surf = self.state_surf(self.state)
 
 	def update(self):
 		super().update()
 		if self._locked:
 			return
 
-		if not self.hovered:
-			if self.highlighted:
-				self.highlighted = False
-				self.font.fgcolor = self.fgcolor
-				self.changed = True
-				self.make_surf()
-		else:
-			if self.highlighted:
-				return
-			self.highlighted = True
-			self.font.fgcolor = self.highlight_color
+		if self.hovered!=self.highlighted:
+			self.highlighted = self.hovered
 			self.changed = True
 			self.make_surf()
 
 class ImageButton(AbstractButton):
 	"""docstring for ImageButton"""
+	__slots__ = BUTTON_SLOTS+("image", "high_image", "highlighted")
+	cache_scaled = True
 	def __init__(self, w, h, alpha=False, action=None, locked=False, image=None, high_image=None):
 		super().__init__(w, h, alpha=alpha, action=action, locked=locked, image=image, high_image=high_image)
 		if not image:
 			raise TypeError("Image must be a Pygame Surface or a path to an image")
+		#images are shared through the assets cache and only ever swapped, never drawn onto
 		self.image = load_surf(image)
 		if not high_image:
-			self.high_image = self.image.copy()
+			self.high_image = self.image
 		else:
 			self.high_image = load_surf(high_image)
+		self.sources = tuple((img, None) for img in (image, high_image) if img)
 
 		#surface
-		self.surf = self.image.copy()
-		self.was_hovered = False
+		self.surf = self.image
+		self.highlighted = False
 
 	@classmethod
 	def from_image(cls, image, *args, **kwargs):
 		"""find a way to re-use the code in the Label class"""
 		surf = load_surf(image)
 		rect = surf.get_rect()
-		return cls(rect.w, rect.h, *args, image=surf, **kwargs)
+		button = cls(rect.w, rect.h, *args, image=image, **kwargs)
+		release_surf(image) #the button holds its own reference
+		return button
+
+	@classmethod
+	def from_atlas(cls, atlas, key, w=None, h=None, *args, **kwargs):
+		"""makes a button from the states of key in atlas: the image and, if it was added with one, the high_image. See Atlas.add"""
+		states = atlas.states(key)
+		high_image = states[1] if len(states)>1 else None
+		return cls(w or states[0].get_width(), h or states[0].get_height(), *args, image=states[0], high_image=high_image, **kwargs)
 
 	@property
 	def locked(self):
-		return self.AbstractButton.locked()
+		return self._locked
+
+	@locked.setter
+	def locked(self, value):
+		self._locked = bool(value)
 
 	def update(self):
 		super().update()
-		if not self._locked and self.hovered:
-			self.surf = self.high_image
-			self.changed = True
-			self.was_hovered=True
-		
-		elif self.was_hovered:
-			self.surf = self.image
-			self.changed = True
-			self.was_hovered=False
\ No newline at end of file
+		highlighted = self.hovered and not self._locked
+		if highlighted!=self.highlighted:
+			self.highlighted = highlighted
+			self.surf = self.high_image if highlighted else self.image
+			self.changed = True
\ No newline at end of file
@@ -1,10 +1,33 @@
 import pygame as pg
 from pigui.colors import *
 from pigui.events import *
-import os
+from pigui.spatial import SpatialGrid
+from pigui.widgets import load_surf, release_surf
+from pigui.profiling import profiler
+
+SCALED_CACHE_SIZE = 4 #maximum amount of rescaled surfaces cached per widget
+
+def is_opaque(surf):
+	"""whether surf hides everything it is blitted over"""
+	return not surf.get_flags()&pg.SRCALPHA and surf.get_colorkey()==None and surf.get_alpha() in (None, 255)
+
+
+class WidgetEntry(object):
+	"""What a container keeps about each of its widgets: the surface drawn for it, possibly rescaled, the container-local rect, whether the surface was rescaled and whether the widget can be hovered"""
+	__slots__ = ("surf", "rect", "needs_resize", "hover")
+
+	def __init__(self, surf, rect, needs_resize, hover):
+		self.surf = surf
+		self.rect = rect
+		self.needs_resize = needs_resize
+		self.hover = hover
+
+	def __repr__(self):
+		return f"<WidgetEntry at {self.rect}>"
+
 
 class Container(object):
-	"""Container class
+	"""Container class. Containers can be added to other containers like widgets: their composited surface is then kept and only made again when one of their widgets changed.
 
 	x:          horizontal position used for drawing
 	y:          vertical position used for drawing
@@ -12,8 +35,12 @@ class Container(object):
 	h:          height of the container
 	bgcolor:    the background color of the widet. Transparent if None. This will slow things down.
 	visible:    whether the container's surface should be blitter to the screen
-	background: a surface or path to image to be used as background. Path may be a string or tuple of strings"""
-	def __init__(self, x, y, w, h, bgcolor=None, visible=True, background=None):
+	background: a surface or path to image to be used as background. Path may be a string or tuple of strings
+	dirty:      whether draw should only blit the areas which changed since the last draw. The destination must then not be cleared between frames:
+	            draw_all repaints the areas left when such a container moves or is hidden
+	smooth:     whether draw should use smoothscale instead of nearest-neighbour scaling when drawing the container at another size"""
+	cache_scaled = False #the surface is drawn onto in place
+	def __init__(self, x, y, w, h, bgcolor=None, visible=True, background=None, dirty=False, smooth=False):
 		#making sure arguments are valid
 		assert not (bgcolor!=None and background!=None), ValueError("Can't set a background color & set a background surface.")
 		self.x = x
@@ -23,13 +50,7 @@ class Container(object):
 
 		#surface
 		if background:
-			if isinstance(background, pg.Surface):
-				surf = background
-			elif isinstance(background, tuple):
-				surf = pg.image.load(os.path.join(*background)).convert()
-			elif isinstance(background, str):
-				surf = pg.image.load(background).convert()
-			self.surf = pg.transform.scale(surf, (w, h))
+			self.surf = pg.transform.scale(load_surf(background), (w, h))
 
 		else:
 			if bgcolor:
@@ -38,13 +59,39 @@ class Container(object):
 				self.bgcolor = ALPHA
 			self.surf = pg.Surface((w, h))
 			self.surf.fill(self.bgcolor)
+		self.background = background
+		self.sources = ((background, None),) if background else () #(img, alpha) of the assets loaded by the container, see release
+		self.bgsurf = self.surf.copy() #drawn back where widgets moved away from
 
 		self.visible = visible
 		self.widgets = {}
 		#an entry looks as such
-		#Button: [resized_surf, area_rect, needs_resize, hover]
-		#Widget: [Surface, Rect, Bool, Bool]
-		self.hovered = [] #lsit of rect, widget tuples
+		#Widget: WidgetEntry(resized_surf, area_rect, needs_resize, hover)
+		self.hoverable = [] #widgets which can be hovered
+		self.scaled = {} #widget: {(id(source_surf), size): (source_surf, resized_surf)}, only for widgets with cache_scaled
+		self.hover_grid = SpatialGrid() #container-local rects of the hovered widgets
+		self.hovering = None #widget currently under the mouse
+		self.last_mouse = None #container-local mouse position of the last hover lookup
+		self.pending = {} #widgets which changed since the last make_surf, in the order they did. Used as an ordered set
+
+		#dirty rendering
+		self.dirty = dirty
+		self.dirty_rects = [] #container-local rects modified since the last draw
+		self.drawn_rect = None #where the container was drawn on the destination last time
+
+		#scaled drawing
+		self.smooth = smooth
+		self.version = 0 #increased whenever the surface changes
+		self.drawn_version = None #version of the surface drawn at drawn_rect by the last scaled draw
+		self.resized = None #(size, smooth, version, Surface) of the last scaled draw
+
+		#layout
+		self.layout = None
+
+		#nesting
+		self.container = None #the parent container, if any
+		self.hover = True
+		self.hovered = False
 
 		#misc
 		self.dispatcher = Dispatcher()
@@ -56,17 +103,26 @@ class Container(object):
 
 	@classmethod
 	def from_background(cls, x, y, background, *args, **kwargs):
-		if isinstance(background, pg.Surface):
-			surf = background
-		elif isinstance(background, tuple):
-			surf = pg.image.load(os.path.join(*background)).convert()
-		elif isinstance(background, str):
-			surf = pg.image.load(background).convert()
-		else:
-			raise TypeError(f"background must be a tuple of strings representing a path to an image or a Pygame Surface not {background}")
-
-		rect = surf.get_rect()
-		return cls(x, y, rect.w, rect.h, *args, background=background, **kwargs)
+		rect = load_surf(background).get_rect()
+		container = cls(x, y, rect.w, rect.h, *args, background=background, **kwargs)
+		release_surf(background) #the container holds its own reference
+		return container
+
+	@property
+	def changed(self):
+		return bool(self.pending)
+
+	@changed.setter
+	def changed(self, value):
+		if value and self.container is not None:
+			self.container.child_changed(self)
+
+	def child_changed(self, widget):
+		"""called when one of the widgets changed. The parent only needs to be told about the first change since its last make_surf"""
+		was_changed = bool(self.pending)
+		self.pending[widget] = None
+		if not was_changed and self.container is not None:
+			self.container.child_changed(self)
 
 	def add(self, widget, x, y, w=None, h=None, cw=None, ch=None, fit=False, override=False, events=None):
 		"""adds the specified widget to the ones handled by the container. \
@@ -76,10 +132,11 @@ class Container(object):
 		h:         resize widget height to h, in pixels
 		cw:        how much of the width of the container the widget should use, in percentage
 		ch:        how much of the height of the container the widget should use, in percentage
-		fit:       if True will override all other parameters and make the widget use the whole container surface **TODO**
+		fit:       if True will override all other parameters and make the widget use the whole container surface
 		override:  whether the new widget dimensions can go over existing widgets"""
 		#making sure arguments are valid		
-		if fit:print("Ignoring 'fit' parameter")
+		if fit:
+			return self.place(widget, pg.Rect(0, 0, self.w, self.h), events=events)
 		assert x<=100 and y<=100, ValueError("Can't place at more than 100% of the container's dimensions")
 		#assert (w or h) or (cw, ch), ValueError("Can't set width and height with both ratio and pixel size")
 
@@ -104,17 +161,16 @@ class Container(object):
 		#handling overblitting protection
 		if not override:
 			for wid in self.widgets.values():				
-				if rect.colliderect(wid[1]):
+				if rect.colliderect(wid.rect):
 					raise ValueError(f"Could not resolve placement of widget. Provided rect ({rect}) overlaps with other widgets. Change position/dimensions or set override.") #change with return False
 
-		#making adapted surface
-		needs_resize = False
-		if rect.w==widget.w and rect.h==widget.h:
-			surf = widget.surf
+		return self.place(widget, rect, events=events)
 
-		else:
-			needs_resize=True
-			surf = pg.transform.scale(widget.surf, (rect.w, rect.h))
+	def place(self, widget, rect, events=None):
+		"""adds the widget at the container-local rect, without any check"""
+		#making adapted surface
+		surf = self.fit_surf(widget, rect)
+		needs_resize = surf is not widget.surf
 
 		#checking for events need
 		if events:
@@ -123,84 +179,371 @@ class Container(object):
 			self.dispatcher[widget] = widget.events
 
 		#adding widget
-		self.widgets[widget] = [surf, rect, needs_resize, widget.hover]
+		self.widgets[widget] = WidgetEntry(surf, rect, needs_resize, widget.hover)
 		if widget.hover:
-			self.hovered.append(widget)
+			self.hoverable.append(widget)
+			self.hover_grid.insert(widget, rect)
+			self.last_mouse = None
+		widget.container = self
+		widget.changed = True
 		return rect
 
+	def move(self, widget, rect):
+		"""moves the widget to the container-local rect, resizing it if needed. What was under its old rect is drawn again"""
+		entry = self.widgets[widget]
+		old = entry.rect
+		rect = pg.Rect(rect)
+		if rect==old:
+			return rect
+
+		entry.rect = rect
+		if entry.hover:
+			self.hover_grid.insert(widget, rect)
+			self.last_mouse = None
+		area = self.surf.blit(self.bgsurf, old, area=old)
+		self.version += 1
+		if self.dirty:
+			self.dirty_rects.append(area)
+		for other, other_entry in self.widgets.items():
+			if other is widget or other_entry.rect.colliderect(old):
+				other.changed = True
+		return rect
+
+	def resize(self, w, h):
+		"""changes the size of the container. Its background is made again and all widgets are drawn again, laid out again if it has a layout"""
+		alpha = self.surf.get_alpha()
+		self.w = w
+		self.h = h
+		if self.background:
+			self.bgsurf = pg.transform.scale(load_surf(self.background), (w, h))
+			release_surf(self.background) #the container already holds a reference
+		else:
+			self.bgsurf = pg.Surface((w, h))
+			self.bgsurf.fill(self.bgcolor)
+		self.surf = self.bgsurf.copy()
+		self.surf.set_alpha(alpha)
+		self.version += 1 #drawn_rect is kept: it no longer matches the container's rect, so the next draw blits it whole and draw_all repaints what it gave up
+		self.last_mouse = None
+		if self.layout:
+			self.relayout()
+		for widget in self.widgets:
+			widget.changed = True
+		self.changed = True
+
+	def set_layout(self, layout):
+		"""lays the widgets out with layout, a Layout from pigui.layout, instead of the positions given to add. Widgets of the layout which aren't in the container yet are added"""
+		self.layout = layout
+		self.relayout()
+
+	def relayout(self):
+		"""arranges the parts of the layout which were invalidated or whose constraints changed and moves their widgets"""
+		placements = []
+		self.layout.measure(self.w, self.h)
+		self.layout.arrange(pg.Rect(0, 0, self.w, self.h), placements)
+		for widget, rect in placements:
+			if widget in self.widgets:
+				self.move(widget, rect)
+			else:
+				self.place(widget, rect)
+
 
 
 	def remove(self, widget):
-		if self.widgets[widget][3]==True:
-			self.hovered.pop(widget)
+		if self.widgets[widget].hover:
+			self.hoverable.remove(widget)
+			self.hover_grid.remove(widget)
+			if self.hovering==widget:
+				widget.hovered = False
+				self.hovering = None
+			self.last_mouse = None
+		if widget in self.dispatcher:
+			del self.dispatcher[widget]
+		self.scaled.pop(widget, None)
+		self.pending.pop(widget, None)
+		widget.container = None
 		self.widgets.pop(widget)
 
+	def discard(self, widget):
+		"""removes the widget for good: its references to assets are released as well, so it must not be added again"""
+		self.remove(widget)
+		widget.release()
+
+	def release(self):
+		"""removes the references of the container and its widgets to the assets they loaded, once it is discarded. Releasing again does nothing"""
+		for img, alpha in self.sources:
+			release_surf(img, alpha)
+		self.sources = ()
+		for widget in self.widgets:
+			widget.release()
+
+	def replace(self, old, new, events=None):
+		"""puts the new widget in place of old, at the same rect and in the same layout slot"""
+		rect = self.widgets[old].rect
+		self.remove(old)
+		if self.layout:
+			item = self.layout.item_of(old)
+			if item:
+				item.widget = new
+				item.invalidate()
+		return self.place(new, rect, events)
+
 
 	def draw(self, dest, *args, **kwargs):
 		"""this will draw the container and all it's widget to the dest surface in the specified location.
-		Arguments can be a Rect instance or x, y, w, h integers. If no argument is provided then the container's attributes will be used."""
+		Arguments can be a Rect instance or x, y, w, h integers. If no argument is provided then the container's attributes will be used.
+		Returns the list of rects of dest which were modified, ready to be given to pg.display.update."""
 		if not self.visible:
-			return
+			return self.undraw()
 
 		self.surf=self.make_surf()
 		if len(args)==0 and len(kwargs)==0:
-			dest.blit(self.surf, (self.x, self.y))
-			return
+			return self.blit_dirty(dest, self.x, self.y)
 
-		elif len(args)==1 and isinstance(args[0], pg.Rect):
+		if len(args)==1 and isinstance(args[0], pg.Rect):
 			rect = args[0]
-			if rect.w!=self.w or rect.h!=self.h:
-				resized_surf = pg.transform.scale(self.surf, (rect.w, rect.h))
-				dest.blit(resized_surf, (rect.x, rect.y))
-				return
-
-			dest.blit(self.surf, (rect.x, rect.y))
-			return
-
 		else:
-			if "w" in kwargs or "h" in kwargs:
-				resized_surf = pg.transform.scale(self.surf, (kwargs["w"], kwargs["h"]))
-				dest.blit(resized_surf, (rect.x, rect.y))
-				return
-			dest.blit(self.surf, (args[0], args[1]))
-
-
-	def update(self):
+			values = dict(zip(("x", "y", "w", "h"), args))
+			values.update(kwargs)
+			rect = pg.Rect(values.get("x", self.x), values.get("y", self.y), values.get("w", self.w), values.get("h", self.h))
+
+		if rect.w!=self.w or rect.h!=self.h:
+			return self.blit_scaled(dest, rect)
+		return self.blit_dirty(dest, rect.x, rect.y)
+
+	def resized_surf(self, size):
+		"""returns the surface scaled to size. It is cached until the surface changes, so that a static container drawn at another size is only scaled once"""
+		key = (tuple(size), self.smooth, self.version)
+		if self.resized is None or self.resized[:3]!=key:
+			if self.smooth and self.surf.get_bitsize() in (24, 32):
+				surf = pg.transform.smoothscale(self.surf, size)
+			else:
+				surf = pg.transform.scale(self.surf, size)
+			surf.set_alpha(self.surf.get_alpha())
+			self.resized = key+(surf,)
+			if profiler.enabled:
+				profiler.count("rescales")
+		return self.resized[3]
+
+	def blit_scaled(self, dest, rect):
+		"""blits the surface scaled to the size of rect. In dirty mode nothing is blitted if neither the surface nor rect changed since the last draw"""
+		surf = self.resized_surf(rect.size)
+		if self.dirty and rect==self.drawn_rect and self.version==self.drawn_version:
+			self.dirty_rects = []
+			return []
+		rects = self.blit_full(dest, surf, rect.x, rect.y)
+		if self.dirty:
+			self.drawn_rect = pg.Rect(rect)
+			self.drawn_version = self.version
+		return rects
+
+	def blit_dirty(self, dest, x, y):
+		"""blits the container's surface to dest at (x, y). In dirty mode only the areas which changed since the last draw are blitted, unless the container moved.
+		Returns the modified rects of dest."""
+		rect = pg.Rect(x, y, self.w, self.h)
+		if not self.dirty:
+			if profiler.enabled:
+				profiler.count("blits")
+			return [dest.blit(self.surf, rect)]
+
+		if rect!=self.drawn_rect:
+			rects = [dest.blit(self.surf, rect)]
+			if profiler.enabled:
+				profiler.count("blits")
+			if self.drawn_rect:
+				rects.append(self.drawn_rect)
+		else:
+			rects = [dest.blit(self.surf, area.move(x, y), area=area) for area in self.dirty_rects]
+			if profiler.enabled:
+				profiler.count("blits", len(rects))
+
+		self.drawn_rect = rect
+		self.dirty_rects = []
+		return rects
+
+	def blit_full(self, dest, surf, x, y):
+		"""blits surf to dest at (x, y) and forgets about the dirty areas since the whole surface was drawn"""
+		rects = [dest.blit(surf, (x, y))]
+		if profiler.enabled:
+			profiler.count("blits")
+		if self.dirty:
+			if self.drawn_rect and self.drawn_rect!=rects[0]:
+				rects.append(self.drawn_rect)
+			self.drawn_rect = None #a resized draw can't be patched later on
+			self.dirty_rects = []
+		return rects
+
+	def vacated(self):
+		"""returns the rect of the destination the container leaves on its next draw at its own position: where it was drawn last if it moved or got hidden since, None otherwise"""
+		if self.drawn_rect is None:
+			return None
+		if not self.visible or self.drawn_rect!=self.get_rect():
+			return self.drawn_rect
+		return None
+
+	def expose(self, rect):
+		"""makes the next draw blit again the part of the container under rect, a rect of the destination which was painted over"""
+		if self.dirty and self.drawn_rect is not None:
+			area = self.drawn_rect.clip(rect)
+			if area:
+				self.dirty_rects.append(area.move(-self.drawn_rect.x, -self.drawn_rect.y))
+
+	def undraw(self):
+		"""returns the area the container used on the destination, if any. This is what needs to be redrawn after it has been hidden"""
+		rects = []
+		if self.drawn_rect:
+			rects.append(self.drawn_rect)
+		self.drawn_rect = None
+		self.dirty_rects = []
+		return rects
+
+
+	def update(self, mouse=None):
+		"""updates hovering and all widgets. mouse is the position of the mouse relative to the container, given by the parent container.
+		Top-level containers get it from pygame."""
 		if not self.visible:
 			return
+		if self.layout and self.layout.dirty:
+			self.relayout()
+
 		#handling hovering
-		mouse = pg.mouse.get_pos()
-		crect = self.get_rect()
-		for wid in self.hovered:
-			wid.hovered=False
-
-		if crect.collidepoint(mouse):
-			for widget in self.hovered:
-				rect = self.widgets[widget][1]
-				real_rect = pg.Rect(rect.x+self.x, rect.y+self.y, rect.w, rect.h)
-				if real_rect.collidepoint(mouse):
-					widget.hovered=True
-					break
-		for widget in self.widgets:
-			widget.update()
+		if mouse is None:
+			mouse = self.dispatcher.mouse_pos()
+			mouse = (mouse[0]-self.x, mouse[1]-self.y)
+		if mouse!=self.last_mouse:
+			self.last_mouse = mouse
+			hovering = None
+			if 0<=mouse[0]<self.w and 0<=mouse[1]<self.h:
+				hovering = self.hover_grid.at(int(mouse[0]), int(mouse[1]))
+
+			if hovering!=self.hovering:
+				if self.hovering:
+					self.hovering.hovered=False
+				if hovering:
+					hovering.hovered=True
+				self.hovering = hovering
+
+		for widget, entry in self.widgets.items():
+			if isinstance(widget, Container):
+				rect = entry.rect
+				widget.update(((mouse[0]-rect.x)*widget.w/rect.w, (mouse[1]-rect.y)*widget.h/rect.h))
+			else:
+				widget.update()
+
+	def needs_frame(self):
+		"""whether updating and drawing the container could change anything: a widget changed, events arrived, the mouse moved or the container moved or got hidden since the last draw.
+		Widgets are expected to only change on events, hovering or when told to: those which change on their own must set changed"""
+		if not self.visible:
+			return self.drawn_rect is not None
+		if self.pending or self.dirty_rects or self.dispatcher.buckets:
+			return True
+		if self.layout and self.layout.dirty:
+			return True
+		if self.dirty and self.drawn_rect is not None and self.drawn_rect.topleft!=(self.x, self.y):
+			return True
+		mouse = self.dispatcher.mouse_pos()
+		return (mouse[0]-self.x, mouse[1]-self.y)!=self.last_mouse
 
 	def make_surf(self):
 		"""updates the containers surface based upon the changes which happened to the widgets' surfaces"""
-		for widget in self.widgets:
-			if widget.changed:
-				widget.changed=False
-				rect = self.widgets[widget][1]
-				#may be improved by checking whether the surf needs to be normalized
-				surf = pg.transform.scale(widget.surf, (rect.w, rect.h))
-				self.widgets[widget][0] = surf
-				self.surf.blit(surf, (rect.x, rect.y))
+		if not self.pending:
+			return self.surf
+
+		pending = self.pending
+		self.pending = {}
+		self.version += 1
+		for widget in pending:
+			entry = self.widgets[widget]
+			if isinstance(widget, Container):
+				widget.make_surf()
+			widget.changed=False
+			rect = entry.rect
+			surf = self.fit_surf(widget, rect)
+			entry.surf = surf
+			entry.needs_resize = surf is not widget.surf
+			if not is_opaque(surf): #the previous surface would show through otherwise
+				self.surf.blit(self.bgsurf, rect, area=rect)
+			area = self.surf.blit(surf, (rect.x, rect.y))
+			if self.dirty:
+				self.dirty_rects.append(area)
+			if profiler.enabled:
+				profiler.count("blits")
 
 		return self.surf
 
+	def fit_surf(self, widget, rect):
+		"""returns the widget's surface at the size of rect. The surface is only rescaled if needed.
+		Widgets whose cache_scaled is True only swap between surfaces they never modify, so their rescaled surfaces are cached by source surface and size."""
+		source = widget.surf
+		if source.get_size()==rect.size:
+			return source
+
+		if not widget.cache_scaled:
+			if profiler.enabled:
+				profiler.count("rescales")
+			return pg.transform.scale(source, rect.size)
+
+		cache = self.scaled.setdefault(widget, {})
+		key = (id(source), rect.size)
+		if key not in cache:
+			if len(cache)>=SCALED_CACHE_SIZE:
+				cache.clear()
+			if profiler.enabled:
+				profiler.count("rescales")
+			cache[key] = (source, pg.transform.scale(source, rect.size)) #keeping source so that its id can't be reused
+		return cache[key][1]
+
 	def get_rect(self):
 		return pg.Rect(self.x, self.y, self.w, self.h)
 
+	@property
+	def opaque(self):
+		"""whether the container's surface hides everything beneath it"""
+		return is_opaque(self.surf)
+
+	@property
+	def alpha(self):
+		"""opacity of the whole container, from 0 to 255"""
+		alpha = self.surf.get_alpha()
+		return 255 if alpha is None else alpha
+
+	@alpha.setter
+	def alpha(self, value):
+		value = int(min(max(0, value), 255))
+		if value==self.alpha:
+			return
+		self.surf.set_alpha(value)
+		self.version += 1
+		if self.dirty:
+			self.dirty_rects.append(self.surf.get_rect())
+		self.changed = True
+
 	def get_surf(self):
 		"""returns a copy of the container's surface"""
 		self.surf=self.make_surf()
-		return self.surf.copy()
\ No newline at end of file
+		return self.surf.copy()
+
+
+def draw_all(dest, containers, background=None):
+	"""draws all containers to dest, in order, and returns the rects of dest which were modified.
+	Meant to be used with pg.display.update instead of pg.display.flip
+
+	background: what is drawn back where dirty containers moved away from or got hidden. Either a Surface blitted at the same place as on dest, a color or a function called with dest and each rect.
+	            Containers drawn over these rects blit them again. It can only be None if no dirty container moves nor gets hidden"""
+	vacated = [rect for rect in (container.vacated() for container in containers) if rect]
+	if vacated:
+		assert background is not None, ValueError("draw_all needs a background to repaint the areas left by dirty containers which moved or got hidden")
+		for rect in vacated:
+			if callable(background):
+				background(dest, rect)
+			elif isinstance(background, pg.Surface):
+				dest.blit(background, rect, area=rect)
+			else:
+				dest.fill(background, rect)
+		for container in containers:
+			for rect in vacated:
+				container.expose(rect)
+
+	rects = []
+	for container in containers:
+		rects.extend(container.draw(dest))
+	return rects
\ No newline at end of file
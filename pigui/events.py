@@ -1,4 +1,15 @@
 import pygame as pg
+import heapq
+
+#window and system events install_filter keeps allowed, since the application rather than widgets handles them. Names missing from older pygame versions are skipped
+SYSTEM_EVENTS = tuple(getattr(pg, name) for name in (
+	"QUIT", "ACTIVEEVENT", "VIDEORESIZE", "VIDEOEXPOSE", "WINDOWSHOWN", "WINDOWHIDDEN", "WINDOWEXPOSED", "WINDOWMOVED", "WINDOWRESIZED", "WINDOWSIZECHANGED",
+	"WINDOWMINIMIZED", "WINDOWMAXIMIZED", "WINDOWRESTORED", "WINDOWENTER", "WINDOWLEAVE", "WINDOWFOCUSGAINED", "WINDOWFOCUSLOST", "WINDOWCLOSE", "WINDOWTAKEFOCUS",
+	"WINDOWHITTEST", "WINDOWICCPROFCHANGED", "WINDOWDISPLAYCHANGED", "APP_TERMINATING", "APP_LOWMEMORY", "APP_WILLENTERBACKGROUND", "APP_DIDENTERBACKGROUND",
+	"APP_WILLENTERFOREGROUND", "APP_DIDENTERFOREGROUND", "RENDER_TARGETS_RESET", "RENDER_DEVICE_RESET", "AUDIODEVICEADDED", "AUDIODEVICEREMOVED",
+	"JOYDEVICEADDED", "JOYDEVICEREMOVED", "CONTROLLERDEVICEADDED", "CONTROLLERDEVICEREMOVED", "CONTROLLERDEVICEREMAPPED", "CLIPBOARDUPDATE",
+	"DROPFILE", "DROPTEXT", "DROPBEGIN", "DROPCOMPLETE") if hasattr(pg, name))
+
 
 class Singleton(type):
 	"""a metaclass that makes your class a a singleton"""
@@ -9,23 +20,151 @@ class Singleton(type):
 		return cls._instances[cls]
 
 
+def merge_motions(events):
+	"""returns a single MOUSEMOTION event standing for the consecutive motion events: the last one with the sum of their rel"""
+	if len(events)==1:
+		return events[0]
+	attributes = dict(events[-1].dict)
+	attributes["rel"] = (sum(event.rel[0] for event in events), sum(event.rel[1] for event in events))
+	return pg.event.Event(pg.MOUSEMOTION, attributes)
+
+
 class Dispatcher(metaclass=Singleton):
-	"""This object dispatches events to all widgets which need it"""
+	"""This object dispatches events to all widgets which need it.
+	Events are bucketed by type once per frame in process, along with their position in the frame so that the buckets of several types can be merged back in order. Widgets can either poll the events of the types they registered with dispatcher[widget]
+	or subscribe a callback which will be called with each event of the given types as soon as it is processed.
+	Before bucketing, events of types no widget nor callback wants are dropped (filter) and consecutive MOUSEMOTION events are merged into one with their rel summed (coalesce).
+	events keeps the raw events given to process, so that the application can still look for QUIT and the like."""
 	def __init__(self):
 		self.widgets = {}
 		self.events = []
+		self.buckets = {}
+		#an entry looks as such
+		#event_type: [Event, ...]
+		self.positions = {} #event_type: [position in the frame of each event of its bucket]
+		self.merged = {} #tuple of event types: their events of this frame in order, for widgets registered for several types
+		self.callbacks = {}
+		#event_type: [callable, ...]
+		self.filter = True
+		self.coalesce = True
+		self.types = None #union of the wanted event types, None when it must be computed again
+		self.allowed = None #extra types allowed by install_filter, None when it isn't installed
+		self.mouse = None #function returning the mouse position, pg.mouse.get_pos when None. Replays use it to play recorded positions back
+		self.recorder = None #Recorder from pigui.replay given every processed frame
 
 	def __setitem__(self, widget, events):
 		self.widgets[widget] = events
+		if self.types is not None and not self.types.issuperset(events):
+			self.types = None
 
 	def __getitem__(self, widget):
-		to_give=[]
-		for event in self.events:
-			if event.type in self.widgets[widget]:
-				to_give.append(event)
-		return to_give
+		"""returns the events of this frame the widget registered for, in the order they happened. The list must not be modified"""
+		types = self.widgets[widget]
+		if len(types)==1:
+			return self.buckets.get(types[0], [])
+
+		key = tuple(types)
+		if key not in self.merged:
+			buckets = [zip(self.positions[event_type], self.buckets[event_type]) for event_type in types if event_type in self.buckets]
+			self.merged[key] = [event for position, event in heapq.merge(*buckets, key=lambda item: item[0])]
+		return self.merged[key]
+
+	def __delitem__(self, widget):
+		del self.widgets[widget]
+		self.types = None
+
+	def __contains__(self, widget):
+		return widget in self.widgets
+
+	def subscribe(self, callback, *types):
+		"""calls callback(event) for every processed event whose type is one of types"""
+		for event_type in types:
+			self.callbacks.setdefault(event_type, []).append(callback)
+		self.types = None
+
+	def unsubscribe(self, callback, *types):
+		for event_type in types:
+			callbacks = self.callbacks[event_type]
+			callbacks.remove(callback)
+			if not callbacks:
+				del self.callbacks[event_type]
+		self.types = None
+
+	def clear(self):
+		"""forgets about all registered widgets, callbacks and events"""
+		self.widgets.clear()
+		self.callbacks.clear()
+		self.events = []
+		self.buckets = {}
+		self.positions = {}
+		self.merged = {}
+		self.types = None
+
+	def mouse_pos(self):
+		"""returns the position of the mouse, read by top-level containers"""
+		return self.mouse() if self.mouse else pg.mouse.get_pos()
+
+	def wanted(self):
+		"""returns the set of event types registered by widgets or subscribed to. Updates pygame's event filter if install_filter was called"""
+		if self.types is None:
+			self.types = set(self.callbacks)
+			for types in self.widgets.values():
+				self.types.update(types)
+			if self.allowed is not None:
+				self.install_filter(*self.allowed)
+		return self.types
+
+	def install_filter(self, *extra):
+		"""makes pygame drop events of unwanted types before they reach its queue. The filter follows the registered widgets until remove_filter is called.
+		Window and system events (SYSTEM_EVENTS), such as QUIT, VIDEORESIZE and focus changes, are always allowed.
+		extra: types to allow anyway, on top of SYSTEM_EVENTS and the types wanted by widgets. Pass the input events the game itself reads, like KEYDOWN"""
+		self.allowed = extra
+		pg.event.set_blocked(None)
+		pg.event.set_allowed(list(self.wanted().union(extra, SYSTEM_EVENTS)))
+
+	def remove_filter(self):
+		self.allowed = None
+		pg.event.set_allowed(None)
+
+	def preprocess(self, events):
+		"""returns events without the unwanted ones and with consecutive MOUSEMOTION events merged"""
+		wanted = self.wanted() if self.filter else None
+		kept = []
+		motions = [] #current run of consecutive motion events
+		for event in events:
+			if wanted is not None and event.type not in wanted:
+				continue
+			if self.coalesce and event.type==pg.MOUSEMOTION:
+				motions.append(event)
+				continue
+			if motions:
+				kept.append(merge_motions(motions))
+				motions = []
+			kept.append(event)
+		if motions:
+			kept.append(merge_motions(motions))
+		return kept
 
 	def process(self, events):
 		self.events = events
+		if self.recorder is not None:
+			self.recorder.record(events, self.mouse_pos())
+		if self.filter or self.coalesce:
+			events = self.preprocess(events)
+		buckets = self.buckets = {}
+		positions = self.positions = {}
+		self.merged = {}
+		for i, event in enumerate(events):
+			if event.type in buckets:
+				buckets[event.type].append(event)
+				positions[event.type].append(i)
+			else:
+				buckets[event.type] = [event]
+				positions[event.type] = [i]
+
+		if self.callbacks:
+			for event in events:
+				for callback in self.callbacks.get(event.type, ()):
+					callback(event)
 
-SELECTED = None
\ No newline at end of file
+SELECTED = None
@@ -0,0 +1,86 @@
+from pygame import freetype
+from collections import OrderedDict
+import threading
+from pigui.profiling import profiler
+
+class FontCache(object):
+	"""Process-wide cache of freetype fonts keyed by (path, size, underline, strong).
+	Fonts given by the cache are shared between all widgets using them: they must not be modified. Colors and sizes should be passed to the render methods instead."""
+	def __init__(self):
+		self.fonts = {}
+		self.lock = threading.Lock()
+
+	def __repr__(self):
+		return f"<FontCache holding {len(self.fonts)} fonts>"
+
+	def __len__(self):
+		return len(self.fonts)
+
+	def get(self, path=None, size=20, underline=False, strong=False):
+		"""returns the font for the given path (None means pg default), size and style, loading it if needed"""
+		key = (path, size, underline, strong)
+		with self.lock:
+			if key not in self.fonts:
+				font = freetype.Font(path, size)
+				font.underline = underline
+				font.strong = strong
+				self.fonts[key] = font
+			return self.fonts[key]
+
+	def clear(self):
+		self.fonts.clear()
+
+
+class TextCache(object):
+	"""LRU cache of rendered text keyed by (font key, text, fgcolor).
+	budget: maximum amount of memory the cached surfaces may use, in bytes. Least recently used surfaces are evicted first."""
+	def __init__(self, budget=4*1024*1024):
+		self.budget = budget
+		self.used = 0
+		self.surfs = OrderedDict()
+		#fonts are shared and freetype faces can't render from two threads at once: renders are serialized
+		self.lock = threading.RLock()
+
+	def __repr__(self):
+		return f"<TextCache using {self.used}/{self.budget} bytes for {len(self.surfs)} surfaces>"
+
+	def __len__(self):
+		return len(self.surfs)
+
+	def render(self, font, text, fgcolor):
+		"""returns the surface of text rendered by font with the fgcolor color. The surface is shared and must not be modified"""
+		key = (font.path, font.size, font.underline, font.strong, text, tuple(fgcolor))
+		with self.lock:
+			if key in self.surfs:
+				self.surfs.move_to_end(key)
+				return self.surfs[key]
+
+			surf = font.render(text, fgcolor=fgcolor)[0]
+			if profiler.enabled:
+				profiler.count("text_renders")
+			size = surf.get_pitch()*surf.get_height()
+			if size<=self.budget:
+				self.surfs[key] = surf
+				self.used += size
+				self.shrink(self.budget)
+			return surf
+
+	def shrink(self, budget):
+		"""evicts the least recently used surfaces until at most budget bytes are used"""
+		with self.lock:
+			while self.used>budget:
+				surf = self.surfs.popitem(last=False)[1]
+				self.used -= surf.get_pitch()*surf.get_height()
+
+	def set_budget(self, budget):
+		self.budget = budget
+		self.shrink(budget)
+
+	def clear(self):
+		with self.lock:
+			self.surfs.clear()
+			self.used = 0
+
+
+font_cache = FontCache()
+text_cache = TextCache()
@@ -1,4 +1,5 @@
 import pygame as pg
+from bisect import bisect_left
 from pigui.widgets import *
 from pigui.colors import *
 from pigui.labels import Label
@@ -6,6 +7,7 @@ from pigui.events import *
 
 class InputField(Widget):
 	"""docstring for InputField, a Widget in which you can write text. It is recommended to use the max_chars parameter for performance"""
+	__slots__ = ("hint_text", "fgcolor", "bgcolor", "underlined", "bold", "font_size", "font", "max_width", "max_chars", "events", "text", "displayer", "widths")
 	def __init__(self, w, h, alpha=False, hint_text="Type here...", fgcolor=BLACK, bgcolor=None, font=None, font_size=20, underlined=False, bold=False, max_chars=None, max_width=None, offset=None):
 		super().__init__(w, h, alpha=alpha)
 		self.hint_text = hint_text
@@ -35,6 +37,10 @@ class InputField(Widget):
 		#displayer; the amont of kwags is quite high which clogs __init__. Should the dunder method use less redundant kwrgs and accept a **kwarg instead which would be passed to the displayer?
 		self.displayer = Label(self.w, self.h, alpha=alpha, text=hint_text, fgcolor=fgcolor, bgcolor=bgcolor, font=font, font_size=font_size, underlined=underlined, bold=bold, offset=offset)
 
+		#widths[i] is the width of text[:i]. Kept up to date on each keystroke so that the shown text can be found without measuring the whole text again
+		self.widths = [0]
+		self.add_widths(self.text)
+
 	@property
 	def surf(self):
 		return self.displayer.surf
@@ -46,21 +52,24 @@ class InputField(Widget):
 		self.changed =True	
 
 
+	def add_widths(self, text):
+		"""appends the widths of the text being added to the end of the field's text"""
+		total = self.widths[-1]
+		for metrics in self.displayer.font.get_metrics(text):
+			if metrics: #None for characters the font doesn't have
+				total += metrics[4]
+			self.widths.append(total)
+
 	def shown_text(self):
+		"""returns the end of the text which fits in the field, of at most max_chars characters"""
+		start = bisect_left(self.widths, self.widths[-1]-self.max_width)
 		if self.max_chars:
-			return self.text[:-self.max_chars]
-		else:
-			full_w = self.displayer.font.get_rect(self.text).w
-			if full_w<=self.max_width:
-				return self.text
-
-			approx_char_size = full_w/len(self.text)
-			shown_chars = int(self.w/approx_char_size)+1
-			while full_w>self.w:
-				print(shown_chars, self.text[shown_chars:])
-				shown_chars-=1
-				full_w = self.displayer.font.get_rect(self.text[len(self.text)-shown_chars:]).w
-			return self.text[len(self.text)-shown_chars:]
+			start = max(start, len(self.text)-self.max_chars)
+		shown = self.text[start:]
+		#advances don't account for glyphs overhanging them
+		while len(shown)>1 and self.displayer.font.get_rect(shown).w>self.displayer.w:
+			shown = shown[1:]
+		return shown
 
 	def update(self):
 		events=None
@@ -78,16 +87,23 @@ class InputField(Widget):
 				if e.type==pg.KEYDOWN:
 					if e.key==8:
 						if len(self.text)<=1 or self.text==self.hint_text:
-							self.text = self.hint_text
+							if self.text!=self.hint_text:
+								self.text = self.hint_text
+								self.widths = [0]
+								self.add_widths(self.text)
 						else:
 							self.text = self.text[:-1]
+							self.widths.pop()
 					else:
 						if self.text!=self.hint_text:
 							self.text+=e.unicode
 						else:
 							self.text = e.unicode
+							self.widths = [0]
+						self.add_widths(e.unicode)
 
-					self.displayer.text = self.shown_text()
-					self.displayer.changed = True
-					self.changed = True
-					print(self.text, self.shown_text())
+					shown = self.shown_text()
+					if shown!=self.displayer.text:
+						self.displayer.text = shown
+						self.displayer.changed = True
+						self.changed = True
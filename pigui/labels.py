@@ -1,7 +1,10 @@
 import pygame as pg
-from pygame import freetype
 from pigui.widgets import *
 from pigui.colors import *
+from pigui.fonts import font_cache, text_cache
+from pigui.profiling import profiler
+from collections import namedtuple
+import re
 
 class Label(Widget):
 	"""Label is a class which provides methods for some common actions used by classes which render text.
@@ -10,13 +13,14 @@ class Label(Widget):
 	text:       string representing the text to be rendered
 	bccolor:    background color
 	fgcolor:    color of the text
-	font:       font to be used. None will default to Pygame's default font
+	font:       font to be used. None will default to Pygame's default font. Fonts are shared between labels through font_cache and must not be modified
 	font_size:  the size of the fonts in font points. Overriden by enlarge and offset
 	underlined: whether the text should be underlined. This is a software rendering post-processing.
 	bold:       whether the text should be bold. Note that this is a software rendering post-processing done on the font. Prefer bold fonts instead
 	background: a surface or path to image to be used as background. Path may be a string or tuple of strings
 	enlarge:        whether the rendered text should be fitted to the widget's surface. Can be overriden by offset
 	offset:     tuple representing x and y offsets. If the rendered text is too big to respect the offsets then it will be resized. Works with enlarge."""
+	__slots__ = ("enlarge", "offset", "background", "_text", "fgcolor", "text_color", "bold", "underlined", "font", "bgsurf", "bgcolor", "chg_area")
 	def __init__(self, w, h, *args, alpha=False, text="", bgcolor=None, fgcolor=BLACK, font=None, font_size=20, underlined=False, bold=False, background=None, enlarge=True, offset=None, **kwargs):
 		super().__init__(w, h, alpha=alpha)
 		#making sure arguments are valid
@@ -31,18 +35,18 @@ class Label(Widget):
 		self.enlarge = enlarge
 		self.offset = offset
 		self.background = background
+		if background:
+			self.sources = ((background, None),)
 
 		#text properties
 		self._text = text
 		self.fgcolor = fgcolor
+		self.text_color = fgcolor #color the text is currently rendered with
 		self.bold = bold
 		self.underlined = underlined
 
 		#font
-		self.font = freetype.Font(font, font_size) #None means pg default
-		self.font.underline = underlined
-		self.font.strong = bold
-		self.font.fgcolor = self.fgcolor
+		self.font = font_cache.get(font, font_size, underlined, bold) #None means pg default
 
 		#surface
 		if background:
@@ -83,7 +87,7 @@ class Label(Widget):
 		if needs_rescale or enlarge:
 			ratios = (srect.w/trect.w, srect.h/trect.h)
 			scale = min(ratios)
-			self.font.size *= scale
+			self.font = font_cache.get(font, max(1, int(font_size*scale)), underlined, bold) #whole sizes so that labels of similar sizes share their font
 
 		self.make_surf()
 
@@ -94,7 +98,9 @@ class Label(Widget):
 	def from_background(cls, background, *args, **kwargs):
 		surf = load_surf(background)
 		rect = surf.get_rect()
-		return cls(rect.w, rect.h, *args, background=background, **kwargs)
+		widget = cls(rect.w, rect.h, *args, background=background, **kwargs)
+		release_surf(background) #the widget holds its own reference
+		return widget
 
 	@classmethod
 	def from_text(cls, text, *args, offset=None, font=None, **kwargs):
@@ -115,8 +121,7 @@ class Label(Widget):
 		self.make_surf(old_text=old_text)
 
 	def render_text(self):
-		rendered = self.font.render(self._text)
-		return rendered[0]
+		return text_cache.render(self.font, self._text, self.text_color)
 
 	def make_surf(self, old_text=None):
 		if not self.changed:
@@ -138,3 +143,241 @@ class Label(Widget):
 		x_offset = (self.w-rect.w)/2
 		y_offset = (self.h-rect.h)/2
 		return(Offset(x_offset, y_offset))
+
+
+#a piece of text of a TextBlock and its style. color None is the block's fgcolor
+Run = namedtuple("Run", ["text", "color", "bold", "underline"], defaults=(None, False, False))
+
+TOKENS = re.compile(r"\s+|\S+")
+
+class TextBlock(Widget):
+	"""Multi-line text made of runs of different styles, wrapped on word boundaries to the widget's width. Lines showing more than the widget's height can be scrolled.
+	The lines of each paragraph are cached, as well as the raster of each visible line: changing a run only lays its paragraph out again and appending text only renders the new lines.
+	See Widget for the 4 first arguments.
+
+	text:         string or list of Run to show. Newlines start new paragraphs
+	fgcolor:      color of the runs without one
+	bgcolor:      background color. Transparent if None
+	font:         font to be used. None will default to Pygame's default font
+	font_size:    size of the font, in points. Lines are not rescaled to fit
+	align:        "left", "center" or "right"
+	line_spacing: space between two lines, in pixels
+	follow:       whether to keep the last line in view as text is appended, like a chat log"""
+	__slots__ = ("_runs", "fgcolor", "bgcolor", "font", "font_size", "align", "line_spacing", "follow", "_scroll", "line_h", "ascent", "lines", "paragraphs", "rasters", "shown", "widths")
+
+	def __init__(self, w, h, *args, alpha=False, text="", fgcolor=BLACK, bgcolor=WHITE, font=None, font_size=16, align="left", line_spacing=2, follow=False, **kwargs):
+		super().__init__(w, h, alpha=alpha)
+		self.fgcolor = fgcolor
+		self.bgcolor = bgcolor if bgcolor else ALPHA
+		self.font = font
+		self.font_size = font_size
+		self.align = align
+		self.line_spacing = line_spacing
+		self.follow = follow
+		self._scroll = 0
+
+		regular = font_cache.get(font, font_size)
+		self.line_h = regular.get_sized_height()+line_spacing
+		self.ascent = regular.get_sized_ascender()
+
+		self.lines = [] #lines of the last layout, as (pieces, width) where pieces are (text, color, bold, underline, x)
+		self.paragraphs = {} #tuple of the paragraph's Run: its lines
+		self.rasters = {} #line: surface, for the lines in view
+		self.shown = {} #y: surface blitted there
+		self.widths = {} #(text, bold, underline): width
+
+		self.surf = pg.Surface((w, h), pg.SRCALPHA) if not bgcolor else pg.Surface((w, h))
+		self.surf.fill(self.bgcolor)
+		self._runs = self.make_runs(text)
+		self.make_surf()
+
+	def __repr__(self):
+		return f"<TextBlock({self.w}, {self.h}) of {len(self._runs)} runs>"
+
+	@staticmethod
+	def make_run(run):
+		"""returns run as a Run whose color is a tuple, since runs are hashed to cache their paragraph's layout"""
+		run = run if isinstance(run, Run) else Run(*run)
+		if run.color is not None and not isinstance(run.color, tuple):
+			run = run._replace(color=tuple(run.color))
+		return run
+
+	@classmethod
+	def make_runs(cls, text):
+		if isinstance(text, str):
+			return [Run(text)] if text else []
+		return [cls.make_run(run) for run in text]
+
+	@property
+	def runs(self):
+		"""the runs of the block. Use set_run, append or assign a new list instead of modifying it"""
+		return self._runs
+
+	@runs.setter
+	def runs(self, runs):
+		self._runs = self.make_runs(runs)
+		self.refresh()
+
+	@property
+	def text(self):
+		return "".join(run.text for run in self._runs)
+
+	@text.setter
+	def text(self, text):
+		self.runs = text
+
+	@property
+	def scroll(self):
+		return self._scroll
+
+	@scroll.setter
+	def scroll(self, scroll):
+		scroll = int(min(max(0, scroll), self.max_scroll))
+		if scroll!=self._scroll:
+			self._scroll = scroll
+			self.refresh()
+
+	@property
+	def max_scroll(self):
+		return max(0, len(self.lines)*self.line_h-self.h)
+
+	def append(self, text, color=None, bold=False, underline=False):
+		"""adds text with the given style at the end of the block"""
+		self._runs.append(self.make_run((text, color, bold, underline)))
+		self.refresh()
+
+	def set_run(self, index, **changes):
+		"""changes the text or style of the index-th run, for instance set_run(2, color=RED)"""
+		self._runs[index] = self.make_run(self._runs[index]._replace(**changes))
+		self.refresh()
+
+	def refresh(self):
+		self.changed = True
+		self.make_surf()
+
+	def measure(self, text, bold, underline):
+		"""returns the advance of text in the given style, in pixels"""
+		key = (text, bold, underline)
+		if key not in self.widths:
+			if len(self.widths)>4096:
+				self.widths.clear()
+			font = font_cache.get(self.font, self.font_size, underline, bold)
+			self.widths[key] = sum(metrics[4] for metrics in font.get_metrics(text) if metrics)
+		return self.widths[key]
+
+	def split(self):
+		"""returns the runs cut into paragraphs, each being a tuple of runs"""
+		paragraphs = [[]]
+		for run in self._runs:
+			parts = run.text.split("\n")
+			for i, part in enumerate(parts):
+				if i:
+					paragraphs.append([])
+				if part:
+					paragraphs[-1].append(run._replace(text=part))
+		return [tuple(paragraph) for paragraph in paragraphs]
+
+	def wrap(self, paragraph):
+		"""returns the lines of a paragraph, breaking them between words. Words wider than the block are broken between characters"""
+		lines = []
+		pieces = [] #[text, color, bold, underline, x]
+		x = 0
+		width = 0 #of the line without its trailing spaces
+
+		for run in paragraph:
+			style = (run.color, run.bold, run.underline)
+			for token in TOKENS.findall(run.text):
+				advance = self.measure(token, run.bold, run.underline)
+				if token.isspace():
+					if pieces:
+						pieces.append([token, *style, x])
+						x += advance
+					continue
+
+				while x+advance>self.w:
+					if pieces:
+						lines.append((pieces, width))
+						pieces, x, width = [], 0, 0
+						continue
+					#the word alone is too wide: cutting it
+					cut = 1
+					while cut<len(token)-1 and self.measure(token[:cut+1], run.bold, run.underline)<=self.w:
+						cut += 1
+					lines.append(([[token[:cut], *style, 0]], self.measure(token[:cut], run.bold, run.underline)))
+					token = token[cut:]
+					advance = self.measure(token, run.bold, run.underline)
+
+				pieces.append([token, *style, x])
+				x += advance
+				width = x
+		lines.append((pieces, width))
+
+		#merging pieces of the same style so that they are rendered at once
+		merged_lines = []
+		for pieces, width in lines:
+			merged = []
+			for piece in pieces:
+				if merged and merged[-1][1:4]==piece[1:4]:
+					merged[-1][0] += piece[0]
+				else:
+					merged.append(piece)
+			merged_lines.append((tuple((text.rstrip() if i==len(merged)-1 else text, color, bold, underline, x) for i, (text, color, bold, underline, x) in enumerate(merged)), width))
+		return merged_lines
+
+	def layout(self):
+		"""returns the lines of the whole block. Only the paragraphs which changed since the last layout are wrapped again"""
+		paragraphs = {}
+		lines = []
+		for paragraph in self.split():
+			if paragraph not in paragraphs:
+				paragraphs[paragraph] = self.paragraphs[paragraph] if paragraph in self.paragraphs else self.wrap(paragraph)
+			lines.extend(paragraphs[paragraph])
+		self.paragraphs = paragraphs
+		return lines
+
+	def render_line(self, line):
+		"""returns the surface of a line, as wide as the block"""
+		pieces, width = line
+		surf = pg.Surface((self.w, self.line_h), pg.SRCALPHA) if self.bgcolor==ALPHA else pg.Surface((self.w, self.line_h))
+		surf.fill(self.bgcolor)
+		offset = {"center": (self.w-width)//2, "right": self.w-width}.get(self.align, 0)
+		for text, color, bold, underline, x in pieces:
+			if not text:
+				continue
+			font = font_cache.get(self.font, self.font_size, underline, bold)
+			rect = font.get_rect(text)
+			font.render_to(surf, (offset+x+rect.x, self.ascent-rect.y), text, fgcolor=color or self.fgcolor)
+			if profiler.enabled:
+				profiler.count("text_renders")
+		return surf
+
+	def make_surf(self):
+		"""lays the text out and blits the lines in view which changed"""
+		if not self.changed:
+			return
+		self.lines = self.layout()
+		if self.follow:
+			self._scroll = self.max_scroll
+		self._scroll = min(self._scroll, self.max_scroll)
+
+		first = self._scroll//self.line_h
+		last = min(len(self.lines), -(-(self._scroll+self.h)//self.line_h))
+		rasters = {}
+		shown = {} #y: raster
+		for index in range(first, last):
+			line = self.lines[index]
+			if line not in rasters:
+				rasters[line] = self.rasters[line] if line in self.rasters else self.render_line(line)
+			shown[index*self.line_h-self._scroll] = rasters[line]
+
+		#clearing where lines were shown but aren't anymore, then blitting the lines which moved or changed
+		for y in self.shown:
+			if y not in shown:
+				self.surf.fill(self.bgcolor, (0, y, self.w, self.line_h))
+		for y, raster in shown.items():
+			if self.shown.get(y) is not raster:
+				if self.bgcolor==ALPHA:
+					self.surf.fill(self.bgcolor, (0, y, self.w, self.line_h))
+				self.surf.blit(raster, (0, y))
+		self.rasters = rasters
+		self.shown = shown
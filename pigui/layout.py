@@ -0,0 +1,268 @@
+import pygame as pg
+
+class Layout(object):
+	"""Base class of layouts, which place widgets in two passes: measure computes the size a node wants for given constraints and arrange gives it its rect.
+	Subclasses override measure_children and arrange_children; the base layout stacks its children in its top left corner.
+	Measures are cached per constraints and arranges per rect, so only the subtrees which were invalidated or whose rect changed are computed again.
+	Children can be widgets, containers or other layouts.
+
+	padding: space left around the children, in pixels
+	grow:    share of the extra space this node gets when laid out in a Row or Column. 0 keeps the measured size"""
+	def __init__(self, *children, padding=0, grow=0):
+		self.padding = padding
+		self.grow = grow
+		self.parent = None
+		self.children = []
+		for child in children:
+			self.append(child)
+		self.measures = {} #(max_w, max_h): (w, h)
+		self.rect = None #rect given by the last arrange
+		self.dirty = True
+
+	def __repr__(self):
+		return f"<{type(self).__name__} of {len(self.children)} children at {self.rect}>"
+
+	def append(self, child):
+		"""adds a child at the end of the layout"""
+		if not isinstance(child, Layout):
+			child = Item(child)
+		child.parent = self
+		self.children.append(child)
+		self.invalidate()
+		return child
+
+	def remove(self, child):
+		"""removes a child layout or widget from the layout"""
+		for node in self.children:
+			if node is child or (isinstance(node, Item) and node.widget is child):
+				self.children.remove(node)
+				node.parent = None
+				self.invalidate()
+				return
+		raise ValueError(f"{child} isn't part of {self}")
+
+	def invalidate(self):
+		"""forgets the cached measures of this node and its ancestors, to be called when the size of something in it changed"""
+		node = self
+		while node is not None:
+			node.measures = {}
+			node.dirty = True
+			node = node.parent
+
+	def item_of(self, widget):
+		"""returns the Item holding widget in this subtree or None"""
+		for child in self.children:
+			found = child.item_of(widget)
+			if found:
+				return found
+		return None
+
+	def widgets(self):
+		"""yields all widgets of this subtree"""
+		for child in self.children:
+			yield from child.widgets()
+
+	def measure(self, max_w, max_h):
+		"""returns the (w, h) size the node wants when given at most (max_w, max_h)"""
+		key = (max_w, max_h)
+		if key not in self.measures:
+			pad = self.padding*2
+			w, h = self.measure_children(max(0, max_w-pad), max(0, max_h-pad))
+			self.measures[key] = (min(max_w, w+pad), min(max_h, h+pad))
+		return self.measures[key]
+
+	def arrange(self, rect, placements):
+		"""gives the node its rect and appends the (widget, rect) pairs of the widgets whose rect changed to placements"""
+		rect = pg.Rect(rect)
+		if not self.dirty and rect==self.rect:
+			return
+		self.rect = rect
+		self.dirty = False
+		self.arrange_children(rect.inflate(-self.padding*2, -self.padding*2), placements)
+
+	def measure_children(self, max_w, max_h):
+		"""returns the size the children need within (max_w, max_h), padding excluded. By default the children are stacked so it is the largest of their sizes"""
+		sizes = [child.measure(max_w, max_h) for child in self.children]
+		return (max((w for w, h in sizes), default=0), max((h for w, h in sizes), default=0))
+
+	def arrange_children(self, area, placements):
+		"""arranges the children in area, the node's rect without padding. By default each child is placed at its measured size in the top left corner"""
+		for child in self.children:
+			child.arrange(pg.Rect(area.topleft, child.measure(area.w, area.h)), placements)
+
+
+class Item(Layout):
+	"""A leaf of the layout holding a single widget. Widgets given to layouts are wrapped in items automatically, use it directly to set grow or a fixed size.
+
+	w: width to give the widget instead of its own
+	h: height to give the widget instead of its own"""
+	def __init__(self, widget, w=None, h=None, grow=0):
+		super().__init__(grow=grow)
+		self.widget = widget
+		self.w = w
+		self.h = h
+
+	def __repr__(self):
+		return f"<Item({self.widget}) at {self.rect}>"
+
+	def item_of(self, widget):
+		return self if self.widget is widget else None
+
+	def widgets(self):
+		yield self.widget
+
+	def measure_children(self, max_w, max_h):
+		return (self.w or self.widget.w, self.h or self.widget.h)
+
+	def arrange_children(self, area, placements):
+		placements.append((self.widget, area))
+
+
+def aligned(size, area, align):
+	"""returns the (offset, length) of something of size along an axis of area length, according to align"""
+	if align=="stretch":
+		return 0, area
+	if align=="center":
+		return (area-size)//2, size
+	if align=="end":
+		return area-size, size
+	return 0, size
+
+
+class Box(Layout):
+	"""Base of Row and Column: children are laid one after the other along an axis.
+
+	spacing: space between two children, in pixels
+	align:   "start", "center", "end" or "stretch": position of the children across the axis"""
+	horizontal = True
+
+	def __init__(self, *children, spacing=0, align="start", **kwargs):
+		self.spacing = spacing
+		self.align = align
+		super().__init__(*children, **kwargs)
+
+	def sizes(self, max_main, max_cross):
+		"""returns the measured (main, cross) size of each child"""
+		sizes = []
+		for child in self.children:
+			if self.horizontal:
+				w, h = child.measure(max_main, max_cross)
+				sizes.append((w, h))
+			else:
+				w, h = child.measure(max_cross, max_main)
+				sizes.append((h, w))
+		return sizes
+
+	def measure_children(self, max_w, max_h):
+		max_main, max_cross = (max_w, max_h) if self.horizontal else (max_h, max_w)
+		sizes = self.sizes(max_main, max_cross)
+		main = sum(size[0] for size in sizes)+self.spacing*max(0, len(sizes)-1)
+		cross = max((size[1] for size in sizes), default=0)
+		return (main, cross) if self.horizontal else (cross, main)
+
+	def arrange_children(self, area, placements):
+		main_size, cross_size = (area.w, area.h) if self.horizontal else (area.h, area.w)
+		sizes = self.sizes(main_size, cross_size)
+		extra = main_size-sum(size[0] for size in sizes)-self.spacing*max(0, len(sizes)-1)
+		grow = sum(child.grow for child in self.children)
+
+		cursor = 0
+		for child, (main, cross) in zip(self.children, sizes):
+			if grow and extra>0 and child.grow:
+				main += extra*child.grow//grow
+			offset, cross = aligned(cross, cross_size, self.align)
+			if self.horizontal:
+				child.arrange((area.x+cursor, area.y+offset, main, cross), placements)
+			else:
+				child.arrange((area.x+offset, area.y+cursor, cross, main), placements)
+			cursor += main+self.spacing
+
+
+class Row(Box):
+	"""Lays its children out from left to right. See Box"""
+	horizontal = True
+
+
+class Column(Box):
+	"""Lays its children out from top to bottom. See Box"""
+	horizontal = False
+
+
+class Grid(Layout):
+	"""Lays its children out in a grid, filled line by line. Each column is as wide as its widest child and each line as high as its highest.
+
+	columns: amount of columns
+	spacing: space between two cells, in pixels
+	align:   "start", "center", "end" or "stretch": position of the children in their cell along both axes"""
+	def __init__(self, *children, columns=2, spacing=0, align="start", **kwargs):
+		self.columns = columns
+		self.spacing = spacing
+		self.align = align
+		super().__init__(*children, **kwargs)
+
+	def tracks(self, max_w, max_h):
+		"""returns the widths of the columns, the heights of the lines and the measured sizes of the children"""
+		sizes = [child.measure(max_w, max_h) for child in self.children]
+		widths = [0]*self.columns
+		heights = [0]*(-(-len(sizes)//self.columns))
+		for i, (w, h) in enumerate(sizes):
+			widths[i%self.columns] = max(widths[i%self.columns], w)
+			heights[i//self.columns] = max(heights[i//self.columns], h)
+		return widths, heights, sizes
+
+	def measure_children(self, max_w, max_h):
+		widths, heights, sizes = self.tracks(max_w, max_h)
+		return (sum(widths)+self.spacing*max(0, len(widths)-1), sum(heights)+self.spacing*max(0, len(heights)-1))
+
+	def arrange_children(self, area, placements):
+		widths, heights, sizes = self.tracks(area.w, area.h)
+		xs = [area.x]
+		for w in widths[:-1]:
+			xs.append(xs[-1]+w+self.spacing)
+		ys = [area.y]
+		for h in heights[:-1]:
+			ys.append(ys[-1]+h+self.spacing)
+
+		for i, (child, (w, h)) in enumerate(zip(self.children, sizes)):
+			column, line = i%self.columns, i//self.columns
+			x, w = aligned(w, widths[column], self.align)
+			y, h = aligned(h, heights[line], self.align)
+			child.arrange((xs[column]+x, ys[line]+y, w, h), placements)
+
+
+class Anchor(Layout):
+	"""Places a single child at its measured size against a point of the area. Since Row and Column give their children their measured size, anchors are meant to be the root of a layout,
+	in a Stack with anchor "stretch" or in a Box with grow and align "stretch".
+
+	anchor: the point, named like pygame Rect attributes: "topleft", "midtop", "center", "bottomright"...
+	offset: (x, y) added to the child's position"""
+	def __init__(self, child, anchor="center", offset=(0, 0), **kwargs):
+		self.anchor = anchor
+		self.offset = offset
+		super().__init__(child, **kwargs)
+
+	def measure_children(self, max_w, max_h):
+		return self.children[0].measure(max_w, max_h)
+
+	def arrange_children(self, area, placements):
+		rect = pg.Rect((0, 0), self.children[0].measure(area.w, area.h))
+		setattr(rect, self.anchor, getattr(area, self.anchor))
+		self.children[0].arrange(rect.move(self.offset), placements)
+
+
+class Stack(Layout):
+	"""Places all its children over the same area, the later ones on top.
+
+	anchor: point of the area children are placed against, see Anchor. "stretch" makes them all use the whole area"""
+	def __init__(self, *children, anchor="topleft", **kwargs):
+		self.anchor = anchor
+		super().__init__(*children, **kwargs)
+
+	def arrange_children(self, area, placements):
+		for child in self.children:
+			if self.anchor=="stretch":
+				child.arrange(area, placements)
+				continue
+			rect = pg.Rect((0, 0), child.measure(area.w, area.h))
+			setattr(rect, self.anchor, getattr(area, self.anchor))
+			child.arrange(rect, placements)
@@ -0,0 +1,228 @@
+import pygame as pg
+from pigui.colors import *
+from pigui.container import Container, is_opaque
+from pigui.profiling import profiler
+
+class GridContainer(Container):
+	"""A scrollable container showing a sequence of items in a grid of cells, which can hold thousands of items.
+	Only the lines of cells in view have widgets: these are made by factory and recycled as the grid scrolls, bind being called to show another item on them.
+	Widgets are rendered to a backing strip of lines used as a ring buffer so that scrolling by a few pixels only costs two blits.
+	See Container for the x, y, w, h and bgcolor arguments. bgcolor is also the background of the cells.
+
+	cell_w:     width of a cell
+	cell_h:     height of a cell
+	factory:    function returning a new widget of size (cell_w, cell_h)
+	bind:       function called with a widget and an item to make the widget show the item
+	items:      sequence of items to show. Can be changed with set_items
+	wheel_step: amount of pixels scrolled per mouse wheel step"""
+	def __init__(self, x, y, w, h, cell_w, cell_h, factory=None, bind=None, items=(), wheel_step=20, bgcolor=None, **kwargs):
+		assert factory!=None and bind!=None, TypeError("factory and bind must be functions")
+		assert cell_w<=w and cell_h<=h, ValueError(f"Cells ({cell_w}, {cell_h}) can't be larger than the container ({w}, {h})")
+		super().__init__(x, y, w, h, bgcolor=bgcolor, **kwargs)
+		self.cell_w = cell_w
+		self.cell_h = cell_h
+		self.factory = factory
+		self.bind = bind
+		self.wheel_step = wheel_step
+		self.cell_color = bgcolor if bgcolor else ALPHA
+
+		self.columns = w//cell_w
+		self.pool = -(-h//cell_h)+1 #amount of lines needed to cover the container at any scroll
+		self.slots = [[] for i in range(self.pool)] #widgets of each line of the strip
+		self.bound = {} #slot: index of the line it shows
+		self.strip = pg.Surface((self.columns*cell_w, self.pool*cell_h))
+		self.strip.fill(self.cell_color)
+
+		self.items = items
+		self.scroll = 0
+		self.shown_scroll = None #scroll at which surf was last composed
+		self.hovering = None
+
+		self.dispatcher[self] = [pg.MOUSEWHEEL]
+
+	def __repr__(self):
+		return f"<{type(self).__name__}({self.x}, {self.y}, {self.w}, {self.h}) showing {len(self.items)} items with {sum(len(slot) for slot in self.slots)} widgets>"
+
+	def add(self, widget, *args, **kwargs):
+		raise TypeError(f"{type(self).__name__} makes its own widgets from its items, use set_items instead")
+
+	@property
+	def lines(self):
+		return -(-len(self.items)//self.columns)
+
+	@property
+	def max_scroll(self):
+		return max(0, self.lines*self.cell_h-self.h)
+
+	def child_changed(self, widget):
+		"""rows aren't tracked individually: make_surf checks the visible ones. Only the parent needs to be told"""
+		if self.container is not None:
+			self.container.child_changed(self)
+
+	def set_items(self, items):
+		"""replaces the items shown by the grid"""
+		self.items = items
+		self.bound = {}
+		self.scroll_to(self.scroll)
+		self.shown_scroll = None
+		self.changed = True
+
+	def refresh(self, index=None):
+		"""binds the item at index again, or all items in view if index is None. To be called when items are modified in place"""
+		if index is None:
+			self.bound = {}
+		else:
+			self.bound.pop((index//self.columns)%self.pool, None)
+		self.shown_scroll = None
+		self.changed = True
+
+	def scroll_to(self, scroll):
+		scroll = int(min(max(0, scroll), self.max_scroll))
+		if scroll!=self.scroll:
+			self.scroll = scroll
+			self.changed = True
+
+	def scroll_by(self, amount):
+		self.scroll_to(self.scroll+amount)
+
+	def visible_lines(self):
+		first = self.scroll//self.cell_h
+		return range(first, min(first+self.pool, self.lines))
+
+	def item_at(self, x, y):
+		"""returns the index of the item under the (x, y) container-local position or None"""
+		column = x//self.cell_w
+		index = (y+self.scroll)//self.cell_h*self.columns+column
+		if 0<=column<self.columns and 0<=index<len(self.items):
+			return index
+		return None
+
+	def widget_of(self, index):
+		"""returns the widget showing the item at index if it is in view, None otherwise"""
+		line = index//self.columns
+		slot = line%self.pool
+		if self.bound.get(slot)!=line:
+			return None
+		return self.slots[slot][index%self.columns]
+
+	def release(self):
+		"""releases the assets of the container and of its pooled widgets"""
+		super().release()
+		for widgets in self.slots:
+			for widget in widgets:
+				widget.release()
+
+	def bind_line(self, line):
+		"""makes the widgets of the line's slot show the items of the line, making them if needed"""
+		slot = line%self.pool
+		widgets = self.slots[slot]
+		for column in range(self.columns):
+			index = line*self.columns+column
+			if column>=len(widgets):
+				widget = self.factory()
+				widget.container = self
+				if hasattr(widget, "events"):
+					self.dispatcher[widget] = widget.events
+				widgets.append(widget)
+
+			widget = widgets[column]
+			if index<len(self.items):
+				self.bind(widget, self.items[index])
+			widget.changed = True
+		self.bound[slot] = line
+
+	def update(self, mouse=None):
+		if not self.visible:
+			return
+
+		if mouse is None:
+			mouse = self.dispatcher.mouse_pos()
+			mouse = (mouse[0]-self.x, mouse[1]-self.y)
+		self.last_mouse = mouse
+		hovering = None
+		if 0<=mouse[0]<self.w and 0<=mouse[1]<self.h:
+			for event in self.dispatcher[self]:
+				self.scroll_by(-event.y*self.wheel_step)
+			index = self.item_at(int(mouse[0]), int(mouse[1]))
+			if index is not None:
+				hovering = self.widget_of(index)
+				if hovering and not hovering.hover:
+					hovering = None
+
+		if hovering!=self.hovering:
+			if self.hovering:
+				self.hovering.hovered = False
+			if hovering:
+				hovering.hovered = True
+			self.hovering = hovering
+
+		for line in self.visible_lines():
+			slot = line%self.pool
+			if self.bound.get(slot)!=line:
+				continue
+			for column, widget in enumerate(self.slots[slot]):
+				if line*self.columns+column<len(self.items):
+					widget.update()
+
+	def needs_frame(self):
+		if super().needs_frame() or self.scroll!=self.shown_scroll:
+			return True
+		for line in self.visible_lines():
+			slot = line%self.pool
+			if self.bound.get(slot)!=line or any(widget.changed for widget in self.slots[slot]):
+				return True
+		return False
+
+	def make_surf(self):
+		"""renders the lines which changed to the strip and composes the visible part of the strip on the container's surface"""
+		changed = False
+		for line in self.visible_lines():
+			slot = line%self.pool
+			if self.bound.get(slot)!=line:
+				self.bind_line(line)
+
+			for column, widget in enumerate(self.slots[slot]):
+				if not widget.changed:
+					continue
+				widget.changed = False
+				rect = pg.Rect(column*self.cell_w, slot*self.cell_h, self.cell_w, self.cell_h)
+				if line*self.columns+column<len(self.items):
+					surf = self.fit_surf(widget, rect)
+					if not is_opaque(surf): #the previous item of the cell would show through otherwise
+						self.strip.fill(self.cell_color, rect)
+					self.strip.blit(surf, rect)
+				else:
+					self.strip.fill(self.cell_color, rect)
+				if profiler.enabled:
+					profiler.count("blits")
+				changed = True
+
+		if changed or self.scroll!=self.shown_scroll:
+			self.compose()
+		return self.surf
+
+	def compose(self):
+		"""blits the visible part of the strip, which can wrap around its end, to the surface"""
+		self.surf.blit(self.bgsurf, (0, 0))
+		strip_h = self.pool*self.cell_h
+		top = self.scroll%strip_h
+		shown = min(self.h, self.lines*self.cell_h-self.scroll)
+		first = min(shown, strip_h-top)
+		self.surf.blit(self.strip, (0, 0), area=pg.Rect(0, top, self.strip.get_width(), first))
+		if shown>first:
+			self.surf.blit(self.strip, (0, first), area=pg.Rect(0, 0, self.strip.get_width(), shown-first))
+		if profiler.enabled:
+			profiler.count("blits", 3 if shown>first else 2)
+
+		self.shown_scroll = self.scroll
+		self.version += 1
+		if self.dirty:
+			self.dirty_rects = [self.surf.get_rect()]
+
+
+class ListContainer(GridContainer):
+	"""A scrollable list of items, one per row. See GridContainer.
+
+	item_h: height of a row"""
+	def __init__(self, x, y, w, h, item_h, factory=None, bind=None, items=(), **kwargs):
+		super().__init__(x, y, w, h, w, item_h, factory=factory, bind=bind, items=items, **kwargs)
@@ -0,0 +1,154 @@
+import pygame as pg
+from concurrent.futures import Future, ThreadPoolExecutor
+from time import perf_counter
+import queue
+import os
+from pygame import freetype
+from pigui.colors import *
+from pigui.widgets import Widget
+from pigui.assets import assets
+from pigui.fonts import text_cache
+from pigui.profiling import profiler
+
+def image_paths(values):
+	"""returns the paths of the image files among values, which can be strings or tuples of strings like load_surf takes them"""
+	paths = []
+	for value in values:
+		if isinstance(value, tuple) and value and all(isinstance(part, str) for part in value):
+			value = os.path.join(*value)
+		if isinstance(value, str) and value not in paths and os.path.isfile(value):
+			paths.append(value)
+	return paths
+
+
+class Placeholder(Widget):
+	"""A plain widget shown in place of a widget which is still being made by the loader. See Loader.fill"""
+	__slots__ = ()
+	def __init__(self, w, h, *args, color=LIGHT_GREY, **kwargs):
+		surf = pg.Surface((w, h))
+		surf.fill(color)
+		super().__init__(w, h, *args, surf=surf, alpha=False, **kwargs)
+
+	def __repr__(self):
+		return f"<Placeholder({self.w}, {self.h})>"
+
+
+class Loader(object):
+	"""Pool of worker threads decoding images and rasterizing text in the background, so that building a large interface doesn't stall frames.
+	Jobs return futures which are only resolved by poll, on the main thread: their callbacks (see Future.add_done_callback) can safely add widgets to containers.
+	Converting surfaces to the display's format needs the display and fonts are shared with the main thread, so workers only decode images and rasterize text with their own fonts.
+	Surfaces are converted and widgets are made by poll.
+
+	workers: amount of worker threads"""
+	def __init__(self, workers=2):
+		self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pigui-loader")
+		self.done = queue.Queue() #(future, finish, result, error) of the jobs to resolve
+		self.pending = 0
+
+	def __repr__(self):
+		return f"<Loader with {self.pending} pending jobs>"
+
+	def run(self, future, func, args, kwargs, finish):
+		"""worker side of a job: calls func and queues its result for poll"""
+		try:
+			self.done.put((future, finish, func(*args, **kwargs), None))
+		except Exception as error:
+			self.done.put((future, finish, None, error))
+
+	def submit(self, func, *args, finish=None, **kwargs):
+		"""calls func with args and kwargs in a worker thread and returns a future of its result.
+		finish: function called by poll on the main thread with the result, returning the value the future is resolved with"""
+		future = Future()
+		future.set_running_or_notify_cancel()
+		self.pending += 1
+		self.executor.submit(self.run, future, func, args, kwargs, finish)
+		return future
+
+	def load_surf(self, img, alpha=None):
+		"""returns a future of the shared surface of img, a path to an image as given to load_surf. Images already in the assets cache are resolved at once.
+		Like load_surf, the surface is shared and adds a reference to the asset."""
+		future = Future()
+		if isinstance(img, pg.Surface):
+			future.set_result(img)
+			return future
+
+		path = os.path.join(*img) if isinstance(img, tuple) else img
+		if assets.cached(path, alpha):
+			future.set_result(assets.load(path, alpha))
+			return future
+		return self.submit(pg.image.load, path, finish=lambda surf: assets.insert(path, surf, alpha))
+
+	def render_text(self, text, font=None, size=20, fgcolor=BLACK, underline=False, strong=False):
+		"""rasterizes text into the text cache in a worker thread, so that labels showing it later don't have to. Returns a future of the surface.
+		The worker renders with a font of its own, which has the same cache key as the shared font of font_cache"""
+		def render():
+			private = freetype.Font(font, size)
+			private.underline = underline
+			private.strong = strong
+			return text_cache.render(private, text, fgcolor)
+		return self.submit(render)
+
+	def fill(self, container, placeholder, factory, *args, **kwargs):
+		"""decodes the images whose paths are among args and kwargs in a worker thread, then makes a widget by calling factory with args and kwargs and puts it in place of placeholder, a widget of container.
+		The widget is made by poll on the main thread, once its images are in the assets cache. If placeholder was removed meanwhile, the widget's assets are released. Returns a future of the widget"""
+		def decode():
+			return [(path, pg.image.load(path)) for path in image_paths(list(args)+list(kwargs.values()))]
+		def finish(decoded):
+			for path, surf in decoded:
+				assets.insert(path, surf)
+			try:
+				return factory(*args, **kwargs)
+			finally:
+				for path, surf in decoded:
+					assets.release(path)
+		future = self.submit(decode, finish=finish)
+		def done(future):
+			if future.exception() is not None:
+				return
+			if placeholder in container.widgets:
+				container.replace(placeholder, future.result())
+			else: #the placeholder was removed meanwhile: the widget won't be shown
+				future.result().release()
+		future.add_done_callback(done)
+		return future
+
+	def poll(self, budget=0.004):
+		"""resolves the futures of finished jobs, running their callbacks, for at most budget seconds (None for no limit). To be called once per frame on the main thread.
+		Returns the amount of jobs resolved"""
+		start = perf_counter()
+		resolved = 0
+		while budget is None or perf_counter()-start<budget:
+			try:
+				future, finish, result, error = self.done.get_nowait()
+			except queue.Empty:
+				break
+
+			self.pending -= 1
+			resolved += 1
+			if error is None and finish:
+				try:
+					result = finish(result)
+				except Exception as finish_error:
+					error = finish_error
+			if error is None:
+				future.set_result(result)
+			else:
+				future.set_exception(error)
+
+		if profiler.enabled and resolved:
+			profiler.count("loaded", resolved)
+		return resolved
+
+	def wait(self):
+		"""blocks until all submitted jobs are resolved"""
+		while self.pending:
+			self.done.put(self.done.get())
+			self.poll(None)
+
+	def shutdown(self):
+		"""stops the workers once their current jobs are done. Pending futures are resolved by a last poll"""
+		self.executor.shutdown(wait=True)
+		self.poll(None)
+
+
+loader = Loader()
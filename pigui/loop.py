@@ -0,0 +1,66 @@
+import pygame as pg
+from pigui.events import Dispatcher
+from pigui.container import draw_all
+from pigui.screen import Screen
+from pigui.animation import animator
+from pigui.loader import loader
+
+class Loop(object):
+	"""Drives pigUI from a game loop, skipping its work entirely while the interface is idle: no input, no running tween or background load and no widget changed.
+	events can also block while idle, so that menus don't keep the CPU busy. As with dirty containers the destination must not be cleared between frames.
+
+	target:     a Screen, or a list of top-level containers drawn with draw_all
+	dest:       surface the containers are drawn to, when target is a list
+	timeout:    longest time events waits for input while idle, in seconds
+	background: given to draw_all to repaint the areas left by dirty containers, when target is a list
+
+	while running:
+		events = loop.events()
+		...
+		pg.display.update(loop.step(events))"""
+	def __init__(self, target, dest=None, timeout=0.5, background=None):
+		assert isinstance(target, Screen) or dest is not None, ValueError("dest must be given to draw containers")
+		self.target = target
+		self.dest = dest
+		self.timeout = timeout
+		self.background = background
+		self.dispatcher = Dispatcher()
+		self.frames = 0 #frames which were updated and drawn
+		self.skipped = 0 #frames which were skipped
+
+	def __repr__(self):
+		return f"<Loop of {self.target}, {self.frames} frames run and {self.skipped} skipped>"
+
+	def needs_frame(self):
+		"""whether something could change in the interface this frame"""
+		if animator.active or loader.pending:
+			return True
+		if isinstance(self.target, Screen):
+			return self.target.needs_frame()
+		return any(container.needs_frame() for container in self.target)
+
+	def events(self, block=True):
+		"""returns the events of this frame. If block is True and the interface is idle, waits for the first one for at most timeout seconds"""
+		if block and not self.dispatcher.buckets and not self.needs_frame():
+			event = pg.event.wait(int(self.timeout*1000))
+			if event.type!=pg.NOEVENT:
+				return [event]+pg.event.get()
+		return pg.event.get()
+
+	def step(self, events):
+		"""hands events to the dispatcher, runs background loads and tweens then updates and draws the interface if needed.
+		Returns the rects of the destination which changed, empty when the frame was skipped"""
+		self.dispatcher.process(events)
+		loader.poll()
+		animator.update()
+		if not self.needs_frame():
+			self.skipped += 1
+			return []
+
+		self.frames += 1
+		if isinstance(self.target, Screen):
+			self.target.update()
+			return self.target.draw()
+		for container in self.target:
+			container.update()
+		return draw_all(self.dest, self.target, self.background)
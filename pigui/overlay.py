@@ -0,0 +1,49 @@
+from pigui.colors import *
+from pigui.labels import Label
+from pigui.container import Container
+from pigui.profiling import profiler
+
+class ProfilerOverlay(Container):
+	"""A container displaying the profiler's statistics: frame time, counters and the most expensive methods. Draw it over your interface like any other container.
+	The profiler must be enabled and its end_frame method called every frame for statistics to be available.
+
+	lines:   amount of lines of text shown
+	line_h:  height of a line, in pixels
+	every:   amount of frames between two refreshes of the text"""
+	def __init__(self, x, y, w=320, lines=6, line_h=16, every=30, bgcolor=BLACK, fgcolor=YELLOW, font=None):
+		super().__init__(x, y, w, lines*line_h, bgcolor=bgcolor)
+		self.every = every
+		self.frame = 0
+		self.lines = []
+		for i in range(lines):
+			label = Label(w, line_h, text=" ", bgcolor=bgcolor, fgcolor=fgcolor, font=font, font_size=line_h*0.8, enlarge=False)
+			self.add(label, 0, i*line_h*100/(self.h-line_h) if lines>1 else 0)
+			self.lines.append(label)
+
+	def __repr__(self):
+		return f"<ProfilerOverlay({self.x}, {self.y}, {self.w}, {self.h})>"
+
+	def texts(self):
+		"""returns the lines of text describing the profiler's current statistics"""
+		summary = profiler.summary()
+		counts = " ".join(f"{name}:{value:.0f}" for name, value in summary["counts"].items())
+		texts = [f"frame {summary['frame_time']:.2f}ms ({summary['frames']} frames)", counts or "no counters"]
+		methods = sorted(summary["methods"].items(), key=lambda item: item[1], reverse=True)
+		texts.extend(f"{name} {spent:.3f}ms" for name, spent in methods)
+		return texts
+
+	def fit_text(self, label, text):
+		"""shortens text until it fits in label"""
+		while text and label.font.get_rect(text).w>label.w:
+			text = text[:-1]
+		return text or " "
+
+	def update(self, mouse=None):
+		super().update(mouse)
+		if self.frame%self.every==0:
+			texts = self.texts()
+			for i, label in enumerate(self.lines):
+				text = self.fit_text(label, texts[i] if i<len(texts) else " ")
+				if text!=label.text:
+					label.text = text
+		self.frame += 1
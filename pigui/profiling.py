@@ -0,0 +1,149 @@
+import time
+from collections import deque
+from functools import wraps
+
+class Profiler(object):
+	"""Opt-in per-frame instrumentation of pigUI's hot paths.
+	While enabled, Container.update, Container.make_surf, Container.draw, Dispatcher.process and the update and make_surf methods of all widget classes are timed per object,
+	and blits, rescales and text renders are counted. When disabled the methods are the original ones, so profiling costs nothing.
+	Call end_frame once per frame, the last window frames are kept.
+	Objects are only kept by id along with their class name and repr, so that profiling doesn't keep removed widgets alive.
+
+	window: amount of frames the statistics are computed over"""
+	def __init__(self, window=120):
+		self.enabled = False
+		self.frames = deque(maxlen=window)
+		#an entry looks as such
+		#{"duration": seconds, "times": {(method, id(obj)): seconds}, "objects": {id(obj): (class name, repr)}, "counts": {name: int}}
+		self.times = {}
+		self.objects = {}
+		self.counts = {}
+		self.patched = [] #(cls, name, original)
+		self.active = set() #calls being timed, so that super() calls aren't counted twice
+		self.frame_start = time.perf_counter()
+
+	def __repr__(self):
+		return f"<Profiler({'enabled' if self.enabled else 'disabled'}) over {len(self.frames)} frames>"
+
+	def targets(self):
+		"""yields the (class, method name) pairs to instrument"""
+		from pigui.container import Container
+		from pigui.events import Dispatcher
+		from pigui.widgets import Widget
+
+		for name in ("update", "make_surf", "draw"):
+			yield Container, name
+		yield Dispatcher, "process"
+
+		classes = [Widget]
+		while classes:
+			cls = classes.pop()
+			classes.extend(cls.__subclasses__())
+			for name in ("update", "make_surf"):
+				if name in cls.__dict__:
+					yield cls, name
+
+	def enable(self):
+		"""instruments all targets. Widget classes defined later won't be instrumented, so this should be called once they are all imported"""
+		if self.enabled:
+			return
+		for cls, name in self.targets():
+			original = cls.__dict__[name]
+			self.patched.append((cls, name, original))
+			setattr(cls, name, self.timed(name, original))
+		self.frame_start = time.perf_counter()
+		self.enabled = True
+
+	def disable(self):
+		for cls, name, original in reversed(self.patched):
+			setattr(cls, name, original)
+		self.patched = []
+		self.active.clear()
+		self.enabled = False
+
+	def timed(self, name, func):
+		profiler = self
+		@wraps(func)
+		def wrapper(obj, *args, **kwargs):
+			key = (name, id(obj))
+			if key in profiler.active:
+				return func(obj, *args, **kwargs)
+
+			profiler.active.add(key)
+			start = time.perf_counter()
+			try:
+				return func(obj, *args, **kwargs)
+			finally:
+				profiler.active.discard(key)
+				profiler.times[key] = profiler.times.get(key, 0)+time.perf_counter()-start
+				if key[1] not in profiler.objects:
+					profiler.objects[key[1]] = (type(obj).__name__, repr(obj))
+		return wrapper
+
+	def count(self, name, amount=1):
+		"""adds amount to the name counter of the current frame. Callers should check enabled first"""
+		self.counts[name] = self.counts.get(name, 0)+amount
+
+	def end_frame(self):
+		"""stores the measures of the frame which just ended and starts a new one"""
+		now = time.perf_counter()
+		if self.enabled:
+			self.frames.append({"duration": now-self.frame_start, "times": self.times, "objects": self.objects, "counts": self.counts})
+		self.times = {}
+		self.objects = {}
+		self.counts = {}
+		self.frame_start = now
+
+	def reset(self):
+		self.frames.clear()
+		self.times = {}
+		self.objects = {}
+		self.counts = {}
+
+	def frame_time(self):
+		"""mean duration of a frame, in seconds"""
+		if not self.frames:
+			return 0
+		return sum(frame["duration"] for frame in self.frames)/len(self.frames)
+
+	def mean_count(self, name):
+		"""mean value of the name counter per frame"""
+		if not self.frames:
+			return 0
+		return sum(frame["counts"].get(name, 0) for frame in self.frames)/len(self.frames)
+
+	def by_method(self):
+		"""returns {"Class.method": mean seconds per frame} summed over all objects of the class"""
+		totals = {}
+		for frame in self.frames:
+			for (name, obj), spent in frame["times"].items():
+				key = f"{frame['objects'][obj][0]}.{name}"
+				totals[key] = totals.get(key, 0)+spent
+		return {key: spent/len(self.frames) for key, spent in totals.items()}
+
+	def top(self, amount=5, name=None):
+		"""returns the amount (repr of the object, method, mean seconds per frame) tuples which took the most time, optionally only for the name method"""
+		totals = {}
+		for frame in self.frames:
+			for (method, obj), spent in frame["times"].items():
+				if name and method!=name:
+					continue
+				key = (method, frame["objects"][obj][1])
+				totals[key] = totals.get(key, 0)+spent
+		ranked = sorted(totals.items(), key=lambda item: item[1], reverse=True)[:amount]
+		return [(obj, method, spent/len(self.frames)) for (method, obj), spent in ranked]
+
+	def summary(self):
+		"""returns the statistics as a JSON serializable dict. Durations are in milliseconds"""
+		counts = set()
+		for frame in self.frames:
+			counts.update(frame["counts"])
+		return {
+			"frames": len(self.frames),
+			"frame_time": self.frame_time()*1000,
+			"methods": {key: spent*1000 for key, spent in self.by_method().items()},
+			"counts": {name: self.mean_count(name) for name in sorted(counts)},
+		}
+
+
+profiler = Profiler()
@@ -0,0 +1,176 @@
+import pygame as pg
+import struct
+import json
+import time
+from collections import namedtuple
+from pigui.events import Dispatcher
+
+#log layout: MAGIC, then for each frame FRAME followed by its events, each being EVENT followed by the payload of its type
+MAGIC = b"PGUILOG\x01"
+FRAME = struct.Struct("<IhhH") #milliseconds since the start of the recording, mouse x, mouse y, amount of events
+EVENT = struct.Struct("<H") #type
+MOTION = struct.Struct("<hhhhB") #pos, rel, buttons and touch as bits
+BUTTON = struct.Struct("<hhBB") #pos, button, touch
+KEY = struct.Struct("<iHi") #key, mod, scancode, followed by unicode as TEXT
+WHEEL = struct.Struct("<hhBB") #x, y, flipped, touch
+TEXT = struct.Struct("<H") #length of the following utf-8 text
+
+Frame = namedtuple("Frame", ["time", "mouse", "events"])
+
+def clamp(value):
+	return min(max(int(value), -32768), 32767)
+
+def pack_text(text):
+	data = text.encode("utf-8")
+	return TEXT.pack(len(data))+data
+
+def unpack_text(data, offset):
+	length = TEXT.unpack_from(data, offset)[0]
+	offset += TEXT.size
+	return data[offset:offset+length].decode("utf-8"), offset+length
+
+def encode_event(event):
+	"""returns the bytes of event in the log. Common input events are packed, others are stored as the JSON of their plain attributes"""
+	kind = event.type
+	header = EVENT.pack(kind)
+	if kind==pg.MOUSEMOTION:
+		bits = sum(1<<i for i, pressed in enumerate(event.buttons) if pressed)|(getattr(event, "touch", False)<<7)
+		return header+MOTION.pack(clamp(event.pos[0]), clamp(event.pos[1]), clamp(event.rel[0]), clamp(event.rel[1]), bits)
+	if kind in (pg.MOUSEBUTTONDOWN, pg.MOUSEBUTTONUP):
+		return header+BUTTON.pack(clamp(event.pos[0]), clamp(event.pos[1]), event.button, getattr(event, "touch", False))
+	if kind in (pg.KEYDOWN, pg.KEYUP):
+		return header+KEY.pack(event.key, event.mod, getattr(event, "scancode", 0))+pack_text(getattr(event, "unicode", ""))
+	if kind==pg.MOUSEWHEEL:
+		return header+WHEEL.pack(clamp(event.x), clamp(event.y), getattr(event, "flipped", False), getattr(event, "touch", False))
+	if kind==pg.TEXTINPUT:
+		return header+pack_text(event.text)
+	attributes = {name: value for name, value in event.dict.items() if isinstance(value, (bool, int, float, str, tuple, list, type(None)))}
+	return header+pack_text(json.dumps(attributes))
+
+def decode_event(data, offset):
+	"""returns the event starting at offset in data and the offset following it"""
+	kind = EVENT.unpack_from(data, offset)[0]
+	offset += EVENT.size
+	if kind==pg.MOUSEMOTION:
+		x, y, rel_x, rel_y, bits = MOTION.unpack_from(data, offset)
+		buttons = tuple(bool(bits&(1<<i)) for i in range(3))
+		return pg.event.Event(kind, pos=(x, y), rel=(rel_x, rel_y), buttons=buttons, touch=bool(bits&128)), offset+MOTION.size
+	if kind in (pg.MOUSEBUTTONDOWN, pg.MOUSEBUTTONUP):
+		x, y, button, touch = BUTTON.unpack_from(data, offset)
+		return pg.event.Event(kind, pos=(x, y), button=button, touch=bool(touch)), offset+BUTTON.size
+	if kind in (pg.KEYDOWN, pg.KEYUP):
+		key, mod, scancode = KEY.unpack_from(data, offset)
+		text, offset = unpack_text(data, offset+KEY.size)
+		return pg.event.Event(kind, key=key, mod=mod, scancode=scancode, unicode=text), offset
+	if kind==pg.MOUSEWHEEL:
+		x, y, flipped, touch = WHEEL.unpack_from(data, offset)
+		return pg.event.Event(kind, x=x, y=y, precise_x=float(x), precise_y=float(y), flipped=bool(flipped), touch=bool(touch)), offset+WHEEL.size
+	if kind==pg.TEXTINPUT:
+		text, offset = unpack_text(data, offset)
+		return pg.event.Event(kind, text=text), offset
+	text, offset = unpack_text(data, offset)
+	attributes = {name: tuple(value) if isinstance(value, list) else value for name, value in json.loads(text).items()}
+	return pg.event.Event(kind, attributes), offset
+
+def read_log(path):
+	"""returns the frames recorded in the log at path"""
+	with open(path, "rb") as file:
+		data = file.read()
+	if not data.startswith(MAGIC):
+		raise ValueError(f"{path} isn't a pigUI event log")
+
+	frames = []
+	offset = len(MAGIC)
+	while offset<len(data):
+		ms, x, y, count = FRAME.unpack_from(data, offset)
+		offset += FRAME.size
+		events = []
+		for i in range(count):
+			event, offset = decode_event(data, offset)
+			events.append(event)
+		frames.append(Frame(ms/1000, (x, y), events))
+	return frames
+
+
+class Recorder(object):
+	"""Writes the events given to Dispatcher.process each frame, along with the mouse position, to a compact binary log which can be replayed with Replay.
+	Recording starts with start, or when used as a context manager.
+
+	path:  file to write the log to
+	clock: function returning the time in seconds"""
+	def __init__(self, path, clock=time.perf_counter):
+		self.path = path
+		self.clock = clock
+		self.file = None
+		self.began = None
+		self.frames = 0
+
+	def __repr__(self):
+		return f"<Recorder to {self.path}, {self.frames} frames recorded>"
+
+	def __enter__(self):
+		return self.start()
+
+	def __exit__(self, *exception):
+		self.stop()
+
+	def start(self):
+		"""opens the log and makes the dispatcher record every frame it processes"""
+		self.file = open(self.path, "wb")
+		self.file.write(MAGIC)
+		self.began = self.clock()
+		Dispatcher().recorder = self
+		return self
+
+	def stop(self):
+		dispatcher = Dispatcher()
+		if dispatcher.recorder is self:
+			dispatcher.recorder = None
+		if self.file:
+			self.file.close()
+			self.file = None
+
+	def record(self, events, mouse):
+		"""writes a frame of events, mouse being the mouse position during the frame"""
+		ms = min(int((self.clock()-self.began)*1000), 0xFFFFFFFF)
+		chunks = [FRAME.pack(ms, clamp(mouse[0]), clamp(mouse[1]), len(events))]
+		chunks.extend(encode_event(event) for event in events)
+		self.file.write(b"".join(chunks))
+		self.frames += 1
+
+
+class Replay(object):
+	"""Plays a log written by Recorder back through the dispatcher, as fast as possible, with the recorded mouse positions instead of the real mouse.
+	Use clock as the clock of time-based parts, like Animator, to replay them deterministically."""
+	def __init__(self, path):
+		self.path = path
+		self.frames = read_log(path)
+		self.time = 0
+
+	def __repr__(self):
+		return f"<Replay of {self.path}, {len(self.frames)} frames>"
+
+	def __len__(self):
+		return len(self.frames)
+
+	def clock(self):
+		"""returns the recorded time of the frame being replayed, in seconds"""
+		return self.time
+
+	def run(self, frame):
+		"""replays every frame: hands its events to the dispatcher then calls frame, the function doing the work of a frame such as updating and drawing containers.
+		Returns the duration of each frame, in seconds"""
+		dispatcher = Dispatcher()
+		mouse = dispatcher.mouse
+		durations = []
+		try:
+			for recorded in self.frames:
+				self.time = recorded.time
+				dispatcher.mouse = lambda: recorded.mouse
+				start = time.perf_counter()
+				dispatcher.process(recorded.events)
+				frame()
+				durations.append(time.perf_counter()-start)
+		finally:
+			dispatcher.mouse = mouse
+		return durations
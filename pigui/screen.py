@@ -0,0 +1,140 @@
+import pygame as pg
+from pigui.colors import *
+from pigui.widgets import load_surf
+from pigui.profiling import profiler
+
+def merge_rects(rects):
+	"""returns a list of disjoint rects covering all rects, overlapping ones being replaced by their union"""
+	merged = []
+	for rect in rects:
+		rect = pg.Rect(rect)
+		i = 0
+		while i<len(merged):
+			if merged[i].colliderect(rect):
+				rect.union_ip(merged.pop(i))
+				i = 0
+			else:
+				i += 1
+		merged.append(rect)
+	return merged
+
+
+class Screen(object):
+	"""Composites top-level containers on a surface, usually the display, in z-order.
+	Only the regions which changed since the last frame are redrawn: containers don't need to be drawn by hand and the destination must not be cleared.
+	Invisible containers and containers fully covered by an opaque container above them are neither updated nor drawn.
+
+	surf:       the surface to draw on
+	bgcolor:    color shown where there is no container
+	background: a surface or path to image to show where there is no container, instead of bgcolor"""
+	def __init__(self, surf, bgcolor=BLACK, background=None):
+		self.surf = surf
+		self.bgcolor = bgcolor
+		self.background = None
+		if background:
+			self.background = pg.transform.scale(load_surf(background), surf.get_size())
+		self.containers = [] #from bottom to top
+		self.drawn = {} #container: rect it was drawn at last frame
+		self.pending = [surf.get_rect()] #regions to redraw regardless of the containers
+
+	def __repr__(self):
+		return f"<Screen({self.surf.get_width()}, {self.surf.get_height()}) compositing {len(self.containers)} containers>"
+
+	def add(self, container, z=None):
+		"""adds the container on top of the others, or at the z index. The screen takes care of drawing it"""
+		container.dirty = True
+		if z is None:
+			self.containers.append(container)
+		else:
+			self.containers.insert(z, container)
+		self.invalidate(container.get_rect())
+
+	def remove(self, container):
+		self.containers.remove(container)
+		self.invalidate(self.drawn.pop(container, container.get_rect()))
+
+	def raise_to_top(self, container):
+		self.containers.remove(container)
+		self.containers.append(container)
+		self.invalidate(container.get_rect())
+
+	def lower_to_bottom(self, container):
+		self.containers.remove(container)
+		self.containers.insert(0, container)
+		self.invalidate(container.get_rect())
+
+	def invalidate(self, rect=None):
+		"""makes the rect region, or the whole surface if None, be redrawn next frame"""
+		self.pending.append(self.surf.get_rect() if rect is None else pg.Rect(rect))
+
+	def shown(self):
+		"""returns the visible containers which aren't fully covered by an opaque container above them, from bottom to top"""
+		visible = [container for container in self.containers if container.visible]
+		shown = []
+		for i, container in enumerate(visible):
+			rect = container.get_rect()
+			if not any(above.opaque and above.get_rect().contains(rect) for above in visible[i+1:]):
+				shown.append(container)
+		return shown
+
+	def needs_frame(self):
+		"""whether updating and drawing could change anything on the surface. See Container.needs_frame"""
+		if self.pending:
+			return True
+		shown = self.shown()
+		if len(shown)!=len(self.drawn):
+			return True
+		return any(self.drawn.get(container)!=container.get_rect() or container.needs_frame() for container in shown)
+
+	def update(self):
+		for container in self.shown():
+			container.update()
+
+	def draw(self):
+		"""redraws the regions which changed and returns them, ready to be given to pg.display.update"""
+		shown = self.shown()
+		regions = self.pending
+		self.pending = []
+
+		rects = {}
+		for container in shown:
+			rect = rects[container] = container.get_rect()
+			container.make_surf()
+			if self.drawn.get(container)!=rect:
+				regions.append(rect)
+			else:
+				regions.extend(area.move(rect.x, rect.y) for area in container.dirty_rects)
+			container.dirty_rects = []
+
+		#containers which moved, got hidden or covered leave their old place to be redrawn
+		for container, rect in self.drawn.items():
+			if rects.get(container)!=rect:
+				regions.append(rect)
+		self.drawn = rects
+
+		regions = merge_rects(region.clip(self.surf.get_rect()) for region in regions)
+		regions = [region for region in regions if region.w and region.h]
+		blits = []
+		for region in regions:
+			stack = [container for container in shown if rects[container].colliderect(region)]
+			#starting from the topmost opaque container covering the whole region
+			start = 0
+			for i in range(len(stack)-1, -1, -1):
+				if stack[i].opaque and rects[stack[i]].contains(region):
+					start = i
+					break
+			else:
+				if self.background:
+					blits.append((self.background, region.topleft, region))
+				else:
+					self.surf.fill(self.bgcolor, region)
+
+			for container in stack[start:]:
+				clip = region.clip(rects[container])
+				blits.append((container.surf, clip.topleft, clip.move(-container.x, -container.y)))
+
+		if blits:
+			self.surf.blits(blits, doreturn=False)
+		if profiler.enabled:
+			profiler.count("blits", len(blits))
+		return regions
@@ -0,0 +1,52 @@
+import pygame as pg
+
+class SpatialGrid(object):
+	"""A uniform grid bucketing rects by the cells they overlap. Used by containers to find which widget is under the mouse without testing all of them.
+
+	cell_size: width and height of a cell, in pixels"""
+	def __init__(self, cell_size=64):
+		self.cell_size = cell_size
+		self.cells = {}
+		#an entry looks as such
+		#(column, row): [widget, ...]
+		self.rects = {}
+
+	def __repr__(self):
+		return f"<SpatialGrid({self.cell_size}) indexing {len(self.rects)} items in {len(self.cells)} cells>"
+
+	def __len__(self):
+		return len(self.rects)
+
+	def __contains__(self, item):
+		return item in self.rects
+
+	def cells_of(self, rect):
+		"""yields the keys of all cells overlapped by rect"""
+		size = self.cell_size
+		for col in range(rect.left//size, (rect.right-1)//size+1):
+			for row in range(rect.top//size, (rect.bottom-1)//size+1):
+				yield (col, row)
+
+	def insert(self, item, rect):
+		if item in self.rects:
+			self.remove(item)
+		rect = pg.Rect(rect)
+		self.rects[item] = rect
+		for key in self.cells_of(rect):
+			self.cells.setdefault(key, []).append(item)
+
+	def remove(self, item):
+		rect = self.rects.pop(item)
+		for key in self.cells_of(rect):
+			cell = self.cells[key]
+			cell.remove(item)
+			if not cell:
+				del self.cells[key]
+
+	def at(self, x, y):
+		"""returns the first inserted item whose rect contains the (x, y) point or None"""
+		#cells keep their items in insertion order
+		for item in self.cells.get((x//self.cell_size, y//self.cell_size), ()):
+			if self.rects[item].collidepoint(x, y):
+				return item
+		return None
@@ -0,0 +1,219 @@
+import pygame as pg
+from pigui.widgets import *
+from pigui.colors import *
+from pigui.fonts import font_cache, text_cache
+from pigui.profiling import profiler
+
+class TableColumn(object):
+	"""A column of a Table.
+
+	name:   title shown in the header, also used to refer to the column
+	values: sequence of the column's values, usually a list or a NumPy array. It is never copied
+	width:  width of the column, in pixels. None shares the width left by the other columns
+	format: function turning a value into the string shown
+	align:  "left", "center" or "right\""""
+	def __init__(self, name, values, width=None, format=str, align="left"):
+		self.name = name
+		self.values = values
+		self.width = width
+		self.format = format
+		self.align = align
+
+	def __repr__(self):
+		return f"<TableColumn({self.name}) of {len(self.values)} values>"
+
+
+class Table(Widget):
+	"""Shows columnar data, such as leaderboards, with tens of thousands of rows. Only the visible cells are formatted and rendered, and they are cached with the value they show:
+	updating a column in bulk only renders the cells in view whose value changed. Sorting and filtering build an index of the rows to show without copying the data.
+	NumPy arrays are sorted with argsort and can be filtered with boolean masks. The table scrolls with the mouse wheel.
+	See Widget for the 4 first arguments.
+
+	columns:      list of TableColumn
+	row_h:        height of a row, in pixels
+	header:       whether to show the names of the columns above the rows
+	fgcolor:      color of the text
+	bgcolor:      background color of the rows
+	header_color: background color of the header
+	padding:      horizontal space left in cells, in pixels
+	wheel_step:   amount of pixels scrolled per mouse wheel step"""
+	__slots__ = ("columns", "row_h", "header", "fgcolor", "bgcolor", "header_color", "padding", "wheel_step", "font", "header_font", "widths", "order", "keep", "index", "_scroll", "cells", "shown", "events")
+
+	def __init__(self, w, h, columns, *args, row_h=20, header=True, fgcolor=BLACK, bgcolor=WHITE, header_color=LIGHT_GREY, font=None, font_size=14, padding=4, wheel_step=20, alpha=False, **kwargs):
+		super().__init__(w, h, alpha=alpha)
+		assert len({len(column.values) for column in columns})<=1, ValueError("All columns must have the same length")
+		self.columns = list(columns)
+		self.row_h = row_h
+		self.header = header
+		self.fgcolor = fgcolor
+		self.bgcolor = bgcolor
+		self.header_color = header_color
+		self.padding = padding
+		self.wheel_step = wheel_step
+		self.font = font_cache.get(font, font_size)
+		self.header_font = font_cache.get(font, font_size, strong=True)
+
+		#widths left unset share the remaining space
+		fixed = sum(column.width for column in self.columns if column.width)
+		free = [column for column in self.columns if not column.width]
+		self.widths = [column.width or max(0, w-fixed)//len(free) for column in self.columns]
+
+		self.order = None #rows in sorted order, None for the natural order
+		self.keep = None #predicate or boolean mask of the rows to show, None for all of them
+		self.index = range(self.rows) #rows shown, in order
+		self._scroll = 0
+		self.cells = {} #(column index, row): (value, surface) of the cells in view
+		self.shown = {} #(x, y): surface blitted there
+
+		self.events = [pg.MOUSEWHEEL]
+		self.hover = True
+		self.surf = pg.Surface((w, h))
+		self.surf.fill(bgcolor)
+		if header:
+			self.draw_header()
+		self.make_surf()
+
+	def __repr__(self):
+		return f"<Table({self.w}, {self.h}) showing {len(self.index)}/{self.rows} rows of {len(self.columns)} columns>"
+
+	@property
+	def rows(self):
+		return len(self.columns[0].values) if self.columns else 0
+
+	@property
+	def top(self):
+		"""y of the first row, below the header"""
+		return self.row_h if self.header else 0
+
+	@property
+	def scroll(self):
+		return self._scroll
+
+	@scroll.setter
+	def scroll(self, scroll):
+		scroll = int(min(max(0, scroll), self.max_scroll))
+		if scroll!=self._scroll:
+			self._scroll = scroll
+			self.refresh()
+
+	@property
+	def max_scroll(self):
+		return max(0, len(self.index)*self.row_h-(self.h-self.top))
+
+	def column(self, name):
+		"""returns the position of the column called name"""
+		for i, column in enumerate(self.columns):
+			if column.name==name:
+				return i
+		raise KeyError(f"{self} has no column {name}")
+
+	def refresh(self):
+		self.changed = True
+		self.make_surf()
+
+	def reindex(self):
+		"""computes the rows shown from the sorting order and the filter"""
+		order = self.order if self.order is not None else range(self.rows)
+		keep = self.keep
+		if keep is None:
+			self.index = order
+		elif callable(keep):
+			self.index = [row for row in order if keep(row)]
+		elif hasattr(keep, "nonzero") and self.order is None:
+			self.index = keep.nonzero()[0]
+		elif hasattr(keep, "nonzero") and hasattr(order, "nonzero"):
+			self.index = order[keep[order]]
+		else:
+			self.index = [row for row in order if keep[row]]
+		self._scroll = min(self._scroll, self.max_scroll)
+		self.refresh()
+
+	def sort(self, name=None, reverse=False):
+		"""shows the rows ordered by the values of the column called name, or in their natural order if name is None"""
+		if name is None:
+			self.order = None
+		else:
+			values = self.columns[self.column(name)].values
+			if hasattr(values, "argsort"):
+				self.order = values.argsort(kind="stable")
+				if reverse:
+					self.order = self.order[::-1]
+			else:
+				self.order = sorted(range(len(values)), key=values.__getitem__, reverse=reverse)
+		self.reindex()
+
+	def filter(self, keep=None):
+		"""only shows the rows kept. keep can be a function called with the index of a row or a boolean sequence, such as a NumPy mask. None shows all rows"""
+		self.keep = keep
+		self.reindex()
+
+	def set_column(self, name, values):
+		"""replaces the values of a column, which must keep the same length. Only the cells in view whose value changed are rendered again.
+		The sorting order and filter are kept: call sort or filter again to apply them to the new values"""
+		assert len(values)==self.rows, ValueError(f"The column must have {self.rows} values, not {len(values)}")
+		self.columns[self.column(name)].values = values
+		self.refresh()
+
+	def row_at(self, x, y):
+		"""returns the row under the (x, y) widget-local position or None"""
+		position = (y-self.top+self._scroll)//self.row_h
+		if y<self.top or not 0<=position<len(self.index):
+			return None
+		return self.index[int(position)]
+
+	def scroll_by(self, amount):
+		self.scroll = self._scroll+amount
+
+	def update(self):
+		if self.hovered:
+			for event in Dispatcher()[self]:
+				self.scroll_by(-event.y*self.wheel_step)
+
+	def render_cell(self, i, text, font, color):
+		"""returns the surface of a cell of the i-th column showing text"""
+		surf = pg.Surface((self.widths[i], self.row_h))
+		surf.fill(color)
+		rendered = text_cache.render(font, text, self.fgcolor)
+		space = self.widths[i]-self.padding*2
+		x = {"center": (space-rendered.get_width())//2, "right": space-rendered.get_width()}.get(self.columns[i].align, 0)
+		surf.blit(rendered, (self.padding+max(0, x), (self.row_h-rendered.get_height())//2), area=pg.Rect(0, 0, space, self.row_h))
+		if profiler.enabled:
+			profiler.count("cells")
+		return surf
+
+	def draw_header(self):
+		x = 0
+		for i, column in enumerate(self.columns):
+			self.surf.blit(self.render_cell(i, column.name, self.header_font, self.header_color), (x, 0))
+			x += self.widths[i]
+
+	def make_surf(self):
+		"""renders the cells in view whose value changed and blits those which moved or changed"""
+		first = self._scroll//self.row_h
+		last = min(len(self.index), -(-(self._scroll+self.h-self.top)//self.row_h))
+		cells = {}
+		shown = {}
+		for position in range(first, last):
+			row = int(self.index[position])
+			y = self.top+position*self.row_h-self._scroll
+			x = 0
+			for i, column in enumerate(self.columns):
+				value = column.values[row]
+				cached = self.cells.get((i, row))
+				if cached is None or cached[0]!=value:
+					cached = (value, self.render_cell(i, column.format(value), self.font, self.bgcolor))
+				cells[(i, row)] = cached
+				shown[(x, y)] = cached[1]
+				x += self.widths[i]
+
+		clip = self.surf.get_clip()
+		self.surf.set_clip(pg.Rect(0, self.top, self.w, self.h-self.top))
+		for position in self.shown:
+			if position not in shown:
+				self.surf.fill(self.bgcolor, (position, self.shown[position].get_size()))
+		for position, surf in shown.items():
+			if self.shown.get(position) is not surf:
+				self.surf.blit(surf, position)
+		self.surf.set_clip(clip)
+		self.cells = cells
+		self.shown = shown
@@ -2,22 +2,32 @@ import pygame as pg
 from collections import namedtuple
 from pigui.colors import *
 from pigui.events import *
+from pigui.assets import assets
 import os
 
 Offset = namedtuple("Offset", ["x", "y"])
 
-def load_surf(img):
+def load_surf(img, alpha=None):
+	"""returns the surface for img, which can be a Surface or a path to an image. Images are loaded through the assets cache so the returned surface is shared and must not be modified.
+	alpha: whether the image should be converted with an alpha channel. If None it is guessed from the image"""
 	if isinstance(img, pg.Surface):
 		surf = img
 	elif isinstance(img, tuple):
-		surf = pg.image.load(os.path.join(*img)).convert()
+		surf = assets.load(os.path.join(*img), alpha)
 	elif isinstance(img, str):
-		surf = pg.image.load(img).convert()
+		surf = assets.load(img, alpha)
 	else:
 		raise TypeError(f"img must be a tuple of strings representing a path to an image or a Pygame Surface not {img}")
 
 	return surf
 
+def release_surf(img, alpha=None):
+	"""removes the reference load_surf added to the asset of img. Surfaces, which load_surf returns as they are, hold no reference"""
+	if isinstance(img, tuple):
+		assets.release(os.path.join(*img), alpha)
+	elif isinstance(img, str):
+		assets.release(img, alpha)
+
 class Widget(object):
 	"""An abstract class from which most widgets inherit. Must always belong to a Container.
 	w:     width of the widget
@@ -26,14 +36,22 @@ class Widget(object):
 	img:   image file to be laoded from disk. This argument must be a tuple of strings specifying the relative path to the asset.
 	alpha: whether the widget must provide support for the alpha channel. If True the given surface (if any) will be converted to alpha. Likewise it will be converted to RGB profile otherwise for improved performance.
 
-	If both surf and img arguments are provided then the class will give an error upon creation."""
+	If both surf and img arguments are provided then the class will give an error upon creation.
+	Subclasses which only ever swap their surface for another one, without drawing onto it, can set cache_scaled so containers keep the rescaled versions of their surfaces.
+	Widgets keep their state in __slots__, which saves memory and speeds attribute access up in interfaces made of thousands of widgets. Subclasses of the library declare their own; subclasses which don't get a __dict__ as usual."""
+	__slots__ = ("w", "h", "hover", "hovered", "alpha", "selected", "surf", "container", "_changed", "sources")
+	cache_scaled = False
+
 	def __init__(self, w, h, *args, surf=None, img=None, alpha=True, **kwargs):
+		self.container = None #the container holding the widget, told when the widget changes
+		self._changed = False
 		self.w = w
 		self.h = h
 		self.hover = False
 		self.hovered = False
 		self.alpha=alpha
 		self.selected = False
+		self.sources = ((img, bool(alpha)),) if img else () #(img, alpha) of the assets loaded by the widget, released by release
 
 		#making surface
 		assert surf==None or img==None, ValueError(f"Both surf ({surf}) and img ({img}) were provided.")
@@ -44,16 +62,26 @@ class Widget(object):
 
 		self.changed = True #whether the surface has changed since the last time the container read it.
 
+	@property
+	def changed(self):
+		return self._changed
+
+	@changed.setter
+	def changed(self, value):
+		self._changed = value
+		if value and self.container is not None:
+			self.container.child_changed(self)
 
 	def load_img(self, path):
 		"""return a surface representing the image located at the specified "path" location. The surface will be of the appropriate profile (RGB or RGBA)"""
-		surf = pg.image.load(os.path.join(*path))
+		return load_surf(path, bool(self.alpha))
 
-		if self.alpha:
-			return surf.convert_alpha()
-		else:
-			return surf.convert()
 
+	def release(self):
+		"""removes the references of the widget to the assets it loaded, listed in sources, once it is discarded. Container.discard calls it. Releasing again does nothing"""
+		for img, alpha in self.sources:
+			release_surf(img, alpha)
+		self.sources = ()
 
 	def update(self, *args):
 		"""generic update function. All widgets should have one since containers will expect one."""
@@ -0,0 +1,27 @@
+from pigui.animation import Animator, Tween
+
+class Clock(object):
+	def __init__(self):
+		self.now = 0
+
+	def __call__(self):
+		return self.now
+
+def test_on_done_cancelling_a_queued_tween():
+	animator = Animator(Clock())
+	values = {}
+	second = Tween(0, 10, 1, lambda value: values.__setitem__("second", value))
+	first = Tween(0, 10, 0, lambda value: values.__setitem__("first", value), on_done=lambda: animator.cancel(second))
+	animator.add(first)
+	animator.add(second)
+	animator.update(budget=None)
+	assert values["first"]==10
+	assert "second" not in values
+	assert not animator.active
+
+def test_on_done_cancelling_its_own_tween():
+	animator = Animator(Clock())
+	tween = Tween(0, 1, 0, lambda value: None, on_done=lambda: animator.cancel(tween))
+	animator.add(tween)
+	animator.update(budget=None)
+	assert not animator.active
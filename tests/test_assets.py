@@ -0,0 +1,48 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import pygame as pg
+from pigui.assets import assets
+from pigui.widgets import Widget
+from pigui.buttons import ImageButton
+from pigui.container import Container
+from pigui.lists import ListContainer
+
+def image(tmp_path, name):
+	pg.init()
+	pg.display.set_mode((1, 1))
+	path = str(tmp_path/name)
+	pg.image.save(pg.Surface((8, 8)), path)
+	return path
+
+def refs(path):
+	return sum(count for (key, alpha), count in assets.refs.items() if key==path)
+
+def test_remove_keeps_assets_and_discard_releases_once(tmp_path):
+	path = image(tmp_path, "button.png")
+	other = ImageButton.from_image(path, action=lambda: None)
+	button = ImageButton.from_image(path, action=lambda: None)
+	container = Container(0, 0, 100, 100)
+	container.add(button, 0, 0)
+	container.remove(button)
+	assert refs(path)==2
+	container.add(button, 0, 0)
+	container.discard(button)
+	assert refs(path)==1
+	button.release()
+	assert refs(path)==1
+	other.release()
+
+def test_widget_img_is_released(tmp_path):
+	path = image(tmp_path, "widget.png")
+	widget = Widget(8, 8, img=path, alpha=False)
+	assert refs(path)==1
+	widget.release()
+	assert refs(path)==0
+
+def test_grid_releases_its_pooled_widgets(tmp_path):
+	path = image(tmp_path, "row.png")
+	grid = ListContainer(0, 0, 50, 50, 10, factory=lambda: Widget(50, 10, img=path, alpha=False), bind=lambda widget, item: None, items=range(20))
+	grid.make_surf()
+	assert refs(path)>0
+	grid.release()
+	assert refs(path)==0
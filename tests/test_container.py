@@ -0,0 +1,19 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import pygame as pg
+from pigui.colors import *
+from pigui.container import Container, draw_all
+
+def test_resize_repaints_vacated_area():
+	pg.init()
+	dest = pg.Surface((300, 300))
+	dest.fill(WHITE)
+	container = Container(0, 0, 200, 150, bgcolor=BLUE, dirty=True)
+	draw_all(dest, [container], background=WHITE)
+	assert dest.get_at((150, 120))==BLUE
+
+	container.resize(100, 80)
+	rects = draw_all(dest, [container], background=WHITE)
+	assert dest.get_at((150, 120))==WHITE
+	assert dest.get_at((50, 40))==BLUE
+	assert any(rect.collidepoint(150, 120) for rect in rects)
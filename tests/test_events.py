@@ -0,0 +1,31 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import pygame as pg
+from pigui.events import Dispatcher
+
+def test_widgets_get_their_events_in_order():
+	dispatcher = Dispatcher()
+	dispatcher.clear()
+	widget = object()
+	dispatcher[widget] = [pg.KEYDOWN, pg.MOUSEBUTTONDOWN]
+	dispatcher.process([
+		pg.event.Event(pg.MOUSEBUTTONDOWN, pos=(0, 0), button=1),
+		pg.event.Event(pg.KEYDOWN, key=pg.K_a),
+		pg.event.Event(pg.MOUSEBUTTONDOWN, pos=(1, 1), button=1),
+	])
+	assert [event.type for event in dispatcher[widget]]==[pg.MOUSEBUTTONDOWN, pg.KEYDOWN, pg.MOUSEBUTTONDOWN]
+	dispatcher.clear()
+
+def test_install_filter_keeps_window_events():
+	pg.init()
+	dispatcher = Dispatcher()
+	dispatcher.clear()
+	dispatcher[object()] = [pg.MOUSEBUTTONDOWN]
+	dispatcher.install_filter(pg.KEYDOWN)
+	try:
+		for event_type in (pg.QUIT, pg.VIDEORESIZE, pg.ACTIVEEVENT, pg.WINDOWFOCUSLOST, pg.MOUSEBUTTONDOWN, pg.KEYDOWN):
+			assert not pg.event.get_blocked(event_type)
+		assert pg.event.get_blocked(pg.KEYUP)
+	finally:
+		dispatcher.remove_filter()
+		dispatcher.clear()
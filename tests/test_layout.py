@@ -0,0 +1,20 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import pygame as pg
+from pigui.widgets import Widget
+from pigui.layout import Layout, Row, Stack, Anchor
+
+def test_base_layout_stacks_children_in_the_top_left_corner():
+	small, large = Widget(10, 20), Widget(30, 5)
+	layout = Layout(small, Row(large), padding=2)
+	assert layout.measure(100, 100)==(34, 24)
+	placements = []
+	layout.arrange(pg.Rect(5, 5, 100, 100), placements)
+	assert dict(placements)=={small: pg.Rect(7, 7, 10, 20), large: pg.Rect(7, 7, 30, 5)}
+
+def test_anchor_in_a_stretched_stack():
+	widget = Widget(30, 30)
+	layout = Stack(Anchor(widget, anchor="bottomright", offset=(-10, -10)), anchor="stretch")
+	placements = []
+	layout.arrange(pg.Rect(0, 0, 300, 200), placements)
+	assert placements==[(widget, pg.Rect(260, 160, 30, 30))]
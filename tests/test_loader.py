@@ -0,0 +1,23 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import pygame as pg
+from pigui.assets import assets
+from pigui.labels import Label
+from pigui.loader import Loader, Placeholder
+from pigui.container import Container
+
+def test_fill_releases_the_widget_of_a_removed_placeholder(tmp_path):
+	pg.init()
+	pg.display.set_mode((1, 1))
+	path = str(tmp_path/"background.png")
+	pg.image.save(pg.Surface((40, 20)), path)
+	loader = Loader(workers=1)
+	container = Container(0, 0, 100, 100)
+	placeholder = Placeholder(40, 20)
+	container.add(placeholder, 0, 0)
+	future = loader.fill(container, placeholder, Label.from_background, path, text="hi")
+	container.remove(placeholder)
+	loader.wait()
+	loader.shutdown()
+	assert future.result() not in container.widgets
+	assert sum(count for (key, alpha), count in assets.refs.items() if key==path)==0
@@ -0,0 +1,26 @@
+import gc
+import os
+import weakref
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import pygame as pg
+from pigui.colors import *
+from pigui.container import Container
+from pigui.profiling import Profiler
+
+def test_profiled_containers_can_be_collected():
+	pg.init()
+	profiler = Profiler()
+	profiler.enable()
+	try:
+		container = Container(0, 0, 50, 50, bgcolor=BLUE)
+		container.make_surf()
+		profiler.end_frame()
+		description = repr(container)
+		ref = weakref.ref(container)
+		del container
+		gc.collect()
+		assert ref() is None
+		assert profiler.top(1, "make_surf")[0][:2]==(description, "make_surf")
+		assert "Container.make_surf" in profiler.by_method()
+	finally:
+		profiler.disable()